@@ -0,0 +1,415 @@
+_author_ = "Asif Rahman"
+_date_ = "Saturday, October 17, 2026"
+_version_ = "1.0"
+_filename_ = "benchmark.py"
+_description_ = "Minesweeper engine benchmarks. Run with python benchmark.py to print timings for every board size."
+
+from engine import Engine
+from engine import NewEngine
+from engine import place_mines
+from engine import bomb_counts_python
+from engine import bomb_counts_numpy
+from engine import numpy
+import argparse
+import json
+import platform
+import probability
+import random
+import save_format
+import solver
+import time
+
+# Board sizes to time (rows, columns, bomb count) - the difficulties plus large custom boards
+BOARD_SIZES = {
+  "easy" : (8, 8, 10),
+  "intermediate" : (16, 16, 40),
+  "expert" : (16, 30, 99),
+  "custom 1000x1000" : (1000, 1000, 200000),
+  "custom 10000x10000" : (10000, 10000, 20000000),
+}
+
+# Seed of every benchmark's games (the same boards every run), and untimed runs before each timing
+SEED = 0
+WARMUPS = 1
+
+# Squares counted one at a time, and moves made, per timing
+SAMPLE_SQUARES = 10000
+SAMPLE_MOVES = 1000
+
+# Biggest boards saved as JSON, and whose game over is timed (every bomb is a square in its event)
+JSON_MAX_SQUARES = 10 ** 6
+END_GAME_MAX_SQUARES = 10 ** 6
+
+# Board sizes the solver is timed on, and how many positions of each
+SOLVER_BOARD_SIZES = ("easy", "intermediate", "expert")
+SOLVER_POSITIONS = 100
+
+# Games played by clicking the square least likely to be a bomb, to time the probabilities after every click
+PROBABILITY_GAMES = 10
+
+
+def best_time(function, repeat, setup=None, warmups=WARMUPS):
+  """ Returns the fastest of repeat calls of function, in seconds, after warmups untimed calls. If setup is given, it is
+  called before every call (untimed) and function is called with what it returns."""
+  times = []
+  for run in range(warmups + repeat):
+    argument = setup() if setup is not None else None
+    start = time.perf_counter()
+    function() if setup is None else function(argument)
+    times.append(time.perf_counter() - start)
+  return min(times[warmups:])
+
+
+def repeats(rows, columns):
+  """ Returns how many times to time a benchmark - small boards are fast enough to repeat for a steadier time."""
+  return 1 if rows * columns > 10 ** 7 else 5
+
+
+def new_game(rows, columns, bomb_count, seed=SEED):
+  """ Returns a new game (no bombs yet) of the board size, always with the same seed unless given."""
+  return NewEngine(Engine.difficulty_for((rows, columns), bomb_count), seed=seed, board_size=(rows, columns),
+                   bomb_count=bomb_count)
+
+
+def clicked_game(rows, columns, bomb_count):
+  """ Returns a game after a first click in the middle of the board."""
+  game = new_game(rows, columns, bomb_count)
+  game.move(game.state_options[1], (rows // 2, columns // 2))
+  return game
+
+
+def benchmark_place_bombs(rows, columns, bomb_count):
+  """ Times placing bombs with the first click in the middle of the board."""
+  square = (rows // 2, columns // 2)
+  return best_time(lambda game: game.place_bombs(square), repeats(rows, columns),
+                   lambda: new_game(rows, columns, bomb_count))
+
+
+def benchmark_place_bomb_counts(rows, columns, bomb_count):
+  """ Times counting the bombs around every square and indexing the openings, once the bombs are placed."""
+  game = new_game(rows, columns, bomb_count)
+  game.place_bombs((rows // 2, columns // 2))
+  return best_time(game.place_bomb_counts, repeats(rows, columns))
+
+
+def benchmark_first_click(rows, columns, bomb_count, prepared):
+  """ Times the first click in the middle of a new game - placing and counting the bombs, then uncovering the opening.
+  If prepared, the game's bombs were prepared before the click (see NewEngine.prepare)."""
+  square = (rows // 2, columns // 2)
+
+  def setup():
+    game = new_game(rows, columns, bomb_count)
+    if prepared:
+      game.prepare()
+    return game
+
+  return best_time(lambda game: game.move(game.state_options[1], square), repeats(rows, columns), setup)
+
+
+def benchmark_bomb_counts(rows, columns, bomb_count, counter):
+  """ Times counting the bombs around every square with the given counting function."""
+  mines = place_mines((rows, columns), bomb_count, (rows // 2, columns // 2), random.Random(SEED))
+
+  # Both paths must agree before their times mean anything
+  if numpy is not None and bomb_counts_python(mines, (rows, columns)) != bomb_counts_numpy(mines, (rows, columns)):
+    raise AssertionError(f"Bomb count paths disagree on {rows}x{columns} board")
+
+  return best_time(lambda: counter(mines, (rows, columns)), repeats(rows, columns))
+
+
+def benchmark_load_json(rows, columns, bomb_count):
+  """ Times verifying and loading a JSON save file's data (after json.load) for a game after its first click."""
+  game = clicked_game(rows, columns, bomb_count)
+  save_text = json.dumps(game.save_data())
+
+  # Each run loads a fresh copy, like reading the file
+  def load():
+    save_format.load_json(Engine(), json.loads(save_text))
+
+  # json.loads is timed separately so the verification time can be worked out
+  repeat = 1 if rows * columns > 10 ** 5 else 5
+  return best_time(load, repeat), best_time(lambda: json.loads(save_text), repeat)
+
+
+def benchmark_get_surrounding_bombs(rows, columns, bomb_count):
+  """ Times counting the bombs around SAMPLE_SQUARES random squares one at a time. Returns the time per square."""
+  game = clicked_game(rows, columns, bomb_count)
+  rng = random.Random(SEED)
+  squares = [(rng.randrange(rows), rng.randrange(columns)) for i in range(SAMPLE_SQUARES)]
+
+  def count_all():
+    for row, column in squares:
+      game.get_surrounding_bombs(row, column)
+
+  return best_time(count_all, repeats(rows, columns)) / len(squares)
+
+
+def benchmark_uncover_zeros(rows, columns, bomb_count):
+  """ Times uncovering the opening of the first click (in the middle of the board, always a zero) on a covered board."""
+  game = clicked_game(rows, columns, bomb_count)
+  square_count = rows * columns
+
+  def cover():
+    game.square_states = bytearray(square_count)
+    game.uncover_count = square_count - bomb_count
+
+  return best_time(lambda unused: game.uncover_zeros((rows // 2, columns // 2)), repeats(rows, columns), cover)
+
+
+def benchmark_move(rows, columns, bomb_count, batched=False):
+  """ Times up to SAMPLE_MOVES moves on distinct random covered squares after the first click, flagging bombs and
+  uncovering the rest (zeros uncover their openings), one at a time or in one apply_moves batch. Every move changes the
+  board and none ends the game (game over is timed by benchmark_end_game). Returns the time per move."""
+  game = clicked_game(rows, columns, bomb_count)
+  rng = random.Random(SEED)
+  start = game.square_states[:], game.uncover_count, game.flag_count
+
+  def restore():
+    game.square_states, game.uncover_count, game.flag_count = start[0][:], start[1], start[2]
+    game.running = True
+
+  # Moves are made as they are picked, so squares an earlier opening uncovered are skipped, and picking stops before the
+  # move that would end the game (or once every square has been tried)
+  moves = []
+  tried = set()
+  while len(moves) < SAMPLE_MOVES and len(tried) < rows * columns:
+    index = rng.randrange(rows * columns)
+    if index in tried:
+      continue
+    tried.add(index)
+    if game.square_states[index] != game.COVERED:
+      continue
+
+    move = (game.state_options[2 if game.mines[index] else 1], divmod(index, columns))
+    game.move(*move)
+    if not game.running:
+      break
+    moves.append(move)
+  restore()
+
+  def play(unused):
+    if batched:
+      game.apply_moves(moves)
+      return
+    for new_state, square in moves:
+      game.move(new_state, square)
+
+  return best_time(play, repeats(rows, columns), restore) / len(moves)
+
+
+def benchmark_end_game(rows, columns, bomb_count):
+  """ Times losing a game after the first click (every bomb is revealed)."""
+  game = clicked_game(rows, columns, bomb_count)
+  start = game.square_states[:]
+
+  def restore():
+    game.square_states = start[:]
+    game.running = True
+
+  return best_time(lambda unused: game.end_game(False), repeats(rows, columns), restore)
+
+
+def benchmark_save(rows, columns, bomb_count):
+  """ Times the binary save file data and, for boards small enough to save as JSON, the JSON save file text
+  (what File > Save writes). Returns the binary time and the JSON time (None if it isn't timed)."""
+  game = clicked_game(rows, columns, bomb_count)
+  binary_time = best_time(lambda: save_format.binary_save_data(game), repeats(rows, columns))
+  json_time = None
+  if rows * columns <= JSON_MAX_SQUARES:
+    json_time = best_time(lambda: json.dumps(game.save_data()), repeats(rows, columns))
+  return binary_time, json_time
+
+
+def benchmark_load_binary(rows, columns, bomb_count):
+  """ Times verifying and loading a binary save file's data for a game after its first click."""
+  data = save_format.binary_save_data(clicked_game(rows, columns, bomb_count))
+  return best_time(lambda: save_format.load_binary_data(Engine(), data), repeats(rows, columns))
+
+
+def display_root():
+  """ Returns a hidden tkinter window to draw boards in, or None if there is no display (or no tkinter)."""
+  try:
+    import tkinter
+  except ImportError:
+    return None
+
+  try:
+    root = tkinter.Tk()
+  except tkinter.TclError:
+    return None
+  root.withdraw()
+  return root
+
+
+def benchmark_output_board(root, rows, columns, bomb_count):
+  """ Times drawing a whole board (after the first click) with the chosen renderer, until tkinter has drawn it."""
+  import tkinter
+  from board import NewBoard
+
+  frame = tkinter.Frame(root)
+  frame.pack()
+  board = NewBoard(Engine.difficulty_for((rows, columns), bomb_count), frame, SEED, (rows, columns), bomb_count)
+  board.move(board.state_options[1], (rows // 2, columns // 2))
+
+  def draw():
+    board.output_board()
+    root.update_idletasks()
+
+  draw_time = best_time(draw, repeats(rows, columns))
+  frame.destroy()
+  return draw_time
+
+
+def solver_positions(rows, columns, bomb_count, count):
+  """ Returns count games in progress, each played from a first click in the middle for a random number of turns.
+  Every turn uncovers the squares the solver finds safe, or a random safe square if it finds none."""
+  rng = random.Random(SEED)
+  positions = []
+
+  while len(positions) < count:
+    game = new_game(rows, columns, bomb_count, rng.getrandbits(32))
+    game.move(game.state_options[1], (rows // 2, columns // 2))
+
+    for turn in range(rng.randrange(1, 40)):
+      if not game.running:
+        break
+
+      safe = solver.solve(game)[0]
+      if not safe:
+        covered = [index for index in range(rows * columns) if game.square_states[index] == game.COVERED and not game.mines[index]]
+        safe = [divmod(rng.choice(covered), columns)]
+      for square in safe:
+        game.move(game.state_options[1], square)
+
+    if game.running:
+      positions.append(game)
+
+  return positions
+
+
+def benchmark_solver(rows, columns, bomb_count):
+  """ Times solving SOLVER_POSITIONS games in progress in one batch. Returns the mean and median time per position."""
+  positions = solver_positions(rows, columns, bomb_count, SOLVER_POSITIONS)
+  batch_time = best_time(lambda: solver.solve_many(positions), 3)
+
+  # Median of single positions - the batch mean includes the rare positions with big components
+  times = sorted(best_time(lambda: solver.solve(position), 3) for position in positions)
+  return batch_time / len(positions), times[len(times) // 2]
+
+
+def benchmark_probabilities(rows, columns, bomb_count):
+  """ Times the bomb probabilities after every click of PROBABILITY_GAMES games, each played by clicking the square least
+  likely to be a bomb. Returns the median time with the components kept from the click before, and from scratch."""
+  rng = random.Random(SEED)
+  kept_times = []
+  scratch_times = []
+
+  for game_number in range(PROBABILITY_GAMES):
+    game = new_game(rows, columns, bomb_count, rng.getrandbits(32))
+    game.move(game.state_options[1], (rows // 2, columns // 2))
+    probabilities = probability.Probabilities()
+
+    while game.running:
+      start = time.perf_counter()
+      square_probabilities, interior = probabilities.calculate(game)
+      kept_times.append(time.perf_counter() - start)
+      scratch_times.append(best_time(lambda: probability.Probabilities().calculate(game), 1))
+
+      # Least likely bomb - a frontier square, or any square no number touches
+      choices = [(chance, square) for square, chance in square_probabilities.items() if game.square_state(*square) == game.COVERED]
+      interior_squares = [divmod(index, columns) for index in range(rows * columns)
+                          if game.square_states[index] == game.COVERED and divmod(index, columns) not in square_probabilities]
+      if interior_squares:
+        choices.append((interior, rng.choice(interior_squares)))
+      game.move(game.state_options[1], min(choices)[1])
+
+  kept_times.sort()
+  scratch_times.sort()
+  return kept_times[len(kept_times) // 2], scratch_times[len(scratch_times) // 2]
+
+
+def run_benchmarks(board_names, gui=True):
+  """ Runs every benchmark on the named board sizes, printing each result as it comes. GUI benchmarks are skipped if gui
+  is False or there is no display. Returns a list of results - benchmark name, board name and seconds."""
+  results = []
+
+  def record(name, board_name, seconds, detail=""):
+    """ Prints and keeps a result."""
+    print(f"{name} {board_name}: {seconds:.9f}s{detail}")
+    results.append({"benchmark" : name, "board" : board_name, "seconds" : seconds})
+
+  root = display_root() if gui else None
+  if root is None:
+    print("No display - skipping output_board")
+
+  for name in board_names:
+    rows, columns, bomb_count = BOARD_SIZES[name]
+    record("place_bombs", name, benchmark_place_bombs(rows, columns, bomb_count))
+    record("place_bomb_counts", name, benchmark_place_bomb_counts(rows, columns, bomb_count))
+    record("first_click", name, benchmark_first_click(rows, columns, bomb_count, False))
+    record("first_click_prepared", name, benchmark_first_click(rows, columns, bomb_count, True))
+    record("bomb_counts_python", name, benchmark_bomb_counts(rows, columns, bomb_count, bomb_counts_python))
+
+    # NumPy path only when it is installed
+    if numpy is not None:
+      record("bomb_counts_numpy", name, benchmark_bomb_counts(rows, columns, bomb_count, bomb_counts_numpy))
+
+    record("get_surrounding_bombs", name, benchmark_get_surrounding_bombs(rows, columns, bomb_count), " per square")
+    record("uncover_zeros", name, benchmark_uncover_zeros(rows, columns, bomb_count))
+    record("move", name, benchmark_move(rows, columns, bomb_count), " per move")
+    record("apply_moves", name, benchmark_move(rows, columns, bomb_count, True), " per move")
+    if rows * columns <= END_GAME_MAX_SQUARES:
+      record("end_game", name, benchmark_end_game(rows, columns, bomb_count))
+
+    binary_time, json_time = benchmark_save(rows, columns, bomb_count)
+    record("save_binary", name, binary_time)
+    record("load_binary", name, benchmark_load_binary(rows, columns, bomb_count))
+
+    # JSON saves of the biggest boards don't fit in memory
+    if json_time is not None:
+      record("save_json", name, json_time)
+      load_time, parse_time = benchmark_load_json(rows, columns, bomb_count)
+      record("load_json", name, load_time, f" ({parse_time:.9f}s json.loads)")
+      record("json_loads", name, parse_time)
+
+    if root is not None:
+      record("output_board", name, benchmark_output_board(root, rows, columns, bomb_count))
+
+    if name in SOLVER_BOARD_SIZES:
+      mean_time, median_time = benchmark_solver(rows, columns, bomb_count)
+      record("solver_mean", name, mean_time, " per position")
+      record("solver_median", name, median_time, " per position")
+      kept_time, scratch_time = benchmark_probabilities(rows, columns, bomb_count)
+      record("probabilities", name, kept_time, f" per click ({scratch_time:.9f}s from scratch)")
+      record("probabilities_scratch", name, scratch_time)
+
+  if root is not None:
+    root.destroy()
+  return results
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="Times every Minesweeper engine hot path on every board size.")
+  parser.add_argument("boards", nargs="*", metavar="board",
+                      help=f"board sizes to time ({', '.join(BOARD_SIZES)}) - every one by default")
+  parser.add_argument("--json", help="file to write the results to as JSON, to compare runs over time")
+  parser.add_argument("--no-gui", action="store_true", help="skip the GUI benchmarks even if there is a display")
+  options = parser.parse_args()
+
+  for name in options.boards:
+    if name not in BOARD_SIZES:
+      parser.error(f"unknown board size {name}")
+
+  results = run_benchmarks(options.boards or list(BOARD_SIZES), not options.no_gui)
+
+  if options.json:
+    with open(options.json, "w") as results_file:
+      json.dump({
+        "time" : time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python" : platform.python_version(),
+        "platform" : platform.platform(),
+        "numpy" : numpy.__version__ if numpy is not None else None,
+        "seed" : SEED,
+        "warmups" : WARMUPS,
+        "results" : results,
+      }, results_file, indent=2)
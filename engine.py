@@ -0,0 +1,756 @@
+_author_ = "Asif Rahman"
+_date_ = "Saturday, October 17, 2026"
+_version_ = "1.0"
+_filename_ = "engine.py"
+_description_ = "Minesweeper game engine. Handles game rules without tkinter, views subscribe to its state-change events."
+
+from functools import lru_cache
+from itertools import compress
+from itertools import repeat
+from array import array
+import random
+import time
+
+# NumPy is optional - bomb counts use a pure Python path without it
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+# Smallest board (in squares) where the NumPy bomb count path is faster
+NUMPY_MIN_SQUARES = 10000
+
+# Biggest board (in squares) that gets a precomputed neighbour table, and how many board sizes are cached
+NEIGHBOUR_TABLE_MAX_SQUARES = 250000
+NEIGHBOUR_TABLE_CACHE_SIZE = 8
+
+# Prepared boards are counted again in full when the 3x3 blocks of the bombs their first click changed would cover more
+# than 1 / RECOUNT_SHARE of the board (small boards, where indexing everything is faster than indexing around them)
+RECOUNT_SHARE = 8
+
+# Translation tables turning bytes into a 1 for every zero, or every flag (square state 2), and 0 for everything else
+ZERO_TABLE = bytes([1]) + bytes(255)
+FLAG_TABLE = bytes(2) + bytes([1]) + bytes(253)
+
+# Bits in a new board's seed and the digits of board codes
+SEED_BITS = 48
+CODE_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def encode_board_code(board_size, bomb_count, seed):
+  """ Returns the shareable code of a seeded board - rows x columns, bomb count and the seed in base 36 (e.g. 16x30-99-2kf8a1x)."""
+  digits = ""
+  while True:
+    seed, digit = divmod(seed, len(CODE_DIGITS))
+    digits = CODE_DIGITS[digit] + digits
+    if seed == 0:
+      break
+  return f"{board_size[0]}x{board_size[1]}-{bomb_count}-{digits}"
+
+
+def decode_board_code(code):
+  """ Returns the board size, bomb count and seed of a board code. Raises ValueError if the code is not valid."""
+  try:
+    size, bomb_count, seed = code.strip().lower().split("-")
+    rows, columns = size.split("x")
+    board_size = (int(rows), int(columns))
+    bomb_count, seed = int(bomb_count), int(seed, len(CODE_DIGITS))
+  except ValueError:
+    raise ValueError(f"Invalid board code {code!r}")
+
+  if min(board_size) < 1 or not 1 <= bomb_count < board_size[0] * board_size[1] or not 0 <= seed < 2 ** SEED_BITS:
+    raise ValueError(f"Invalid board code {code!r}")
+  return board_size, bomb_count, seed
+
+
+def safe_zone(board_size, bomb_count, square, safe_radius=1):
+  """ Returns the first and last + 1 rows and columns within safe_radius of square (top, bottom, left, right).
+  The radius shrinks if it leaves too few squares for the bombs."""
+  rows, columns = board_size
+  while True:
+    top, bottom = max(0, square[0] - safe_radius), min(rows, square[0] + safe_radius + 1)
+    left, right = max(0, square[1] - safe_radius), min(columns, square[1] + safe_radius + 1)
+
+    if safe_radius == 0 or rows * columns - (bottom - top) * (right - left) >= bomb_count:
+      return top, bottom, left, right
+    safe_radius -= 1
+
+
+def mine_table(board_size, bomb_count, safe_count):
+  """ Returns the translation table turning random bytes into bombs (1) at the bomb density outside a safe zone of
+  safe_count squares."""
+  threshold = min(256, round(bomb_count / max(1, board_size[0] * board_size[1] - safe_count) * 256))
+  return bytes([1]) * threshold + bytes(256 - threshold)
+
+
+def scatter_mines(board_size, table, rng=random):
+  """ Returns a bytearray with a 1 for every square whose random byte is a bomb in table (see mine_table) - about the right
+  number of bombs, anywhere on the board. rng needs random.Random's randbytes method."""
+  return bytearray(rng.randbytes(board_size[0] * board_size[1]).translate(table))
+
+
+def settle_mines(mines, board_size, bomb_count, zone, rng=random, placed=None):
+  """ Clears scattered mines from the safe zone (top, bottom, left, right), then adds or removes random bombs until there
+  are exactly bomb_count (every layout stays equally likely). placed is the number of scattered mines, if known (counting
+  them is the slowest part on big boards). Returns the lists of indices whose bombs were removed and added.
+  rng needs random.Random's randrange method."""
+  rows, columns = board_size
+  square_count = rows * columns
+  top, bottom, left, right = zone
+  removed = []
+  added = []
+
+  # Clears the safe zone
+  for i in range(top, bottom):
+    index = mines.find(1, i * columns + left, i * columns + right)
+    while index != -1:
+      mines[index] = 0
+      removed.append(index)
+      index = mines.find(1, index + 1, i * columns + right)
+
+  # Adds or removes random bombs until the count is exact
+  placed = mines.count(1) if placed is None else placed - len(removed)
+  while placed < bomb_count:
+    index = rng.randrange(square_count)
+    if not mines[index] and not (top <= index // columns < bottom and left <= index % columns < right):
+      mines[index] = 1
+      added.append(index)
+      placed += 1
+
+  while placed > bomb_count:
+    index = rng.randrange(square_count)
+    if mines[index]:
+      mines[index] = 0
+      removed.append(index)
+      placed -= 1
+
+  return removed, added
+
+
+def place_mines(board_size, bomb_count, square, rng=random, safe_radius=1):
+  """ Returns a bytearray with a 1 for each of bomb_count bombs, none within safe_radius of square. Linear in board size.
+  rng needs random.Random's randbytes and randrange methods. Boards prepared before their first click (see
+  NewEngine.prepare) make the same rng calls, so a seed always gives the same board."""
+  zone = safe_zone(board_size, bomb_count, square, safe_radius)
+  safe_count = (zone[1] - zone[0]) * (zone[3] - zone[2])
+  mines = scatter_mines(board_size, mine_table(board_size, bomb_count, safe_count), rng)
+  settle_mines(mines, board_size, bomb_count, zone, rng)
+  return mines
+
+
+def bomb_counts_python(mines, board_size):
+  """ Returns a bytearray with the bomb count of the 3x3 block around every square (including the square).
+  Each row is added as one big integer with a byte per square, so the additions run in C."""
+  rows, columns = board_size
+  row_mask = (1 << (8 * columns)) - 1
+
+  # Sum of every square and its left and right neighbours (counts never carry into the next byte)
+  row_sums = []
+  for i in range(rows):
+    row = int.from_bytes(mines[i * columns : (i + 1) * columns], "big")
+    row_sums.append(row + ((row << 8) & row_mask) + (row >> 8))
+
+  # Adds the row sums above and below
+  counts = bytearray()
+  for i in range(rows):
+    total = row_sums[i]
+    if i > 0:
+      total += row_sums[i - 1]
+    if i < rows - 1:
+      total += row_sums[i + 1]
+    counts += total.to_bytes(columns, "big")
+
+  return counts
+
+
+def bomb_counts_numpy(mines, board_size):
+  """ Returns the same bytearray as bomb_counts_python, as a 3x3 sum over the padded mine grid in NumPy."""
+  rows, columns = board_size
+  grid = numpy.pad(numpy.frombuffer(bytes(mines), dtype=numpy.uint8).reshape(rows, columns), 1)
+  counts = sum(grid[i : i + rows, j : j + columns] for i in range(3) for j in range(3))
+  return bytearray(counts.astype(numpy.uint8).tobytes())
+
+
+def bomb_counts(mines, board_size):
+  """ Returns the bomb count of the 3x3 block around every square, using NumPy for large boards if it is installed."""
+  # NumPy's setup costs more than the pure Python path on small boards
+  if numpy is not None and len(mines) > NUMPY_MIN_SQUARES:
+    return bomb_counts_numpy(mines, board_size)
+  return bomb_counts_python(mines, board_size)
+
+
+@lru_cache(maxsize=NEIGHBOUR_TABLE_CACHE_SIZE)
+def neighbour_table(board_size):
+  """ Returns a tuple with the flat indices of every square's neighbours (not including the square itself).
+  Cached per board size, so every board of the same size shares one table."""
+  calculator = NeighbourCalculator(board_size)
+  return tuple(calculator[index] for index in range(board_size[0] * board_size[1]))
+
+
+class NeighbourCalculator:
+  """ Works out neighbours when they are looked up, for boards too big for a neighbour table. Indexed like a table."""
+  __slots__ = ("rows", "columns")
+
+  def __init__(self, board_size):
+    """ Saves the board size."""
+    self.rows, self.columns = board_size
+
+  def __getitem__(self, index):
+    """ Returns the flat indices of the square's neighbours."""
+    row, column = divmod(index, self.columns)
+    left, right = max(0, column - 1), min(self.columns, column + 2)
+    return tuple(i * self.columns + j for i in range(max(0, row - 1), min(self.rows, row + 2))
+                 for j in range(left, right) if i != row or j != column)
+
+
+def neighbours(board_size):
+  """ Returns the neighbour table for the board size, or a calculator for boards too big for a table."""
+  board_size = tuple(board_size)
+  if board_size[0] * board_size[1] <= NEIGHBOUR_TABLE_MAX_SQUARES:
+    return neighbour_table(board_size)
+  return NeighbourCalculator(board_size)
+
+
+class Engine:
+  """ Minesweeper game rules. Notifies subscribers of every state change instead of drawing.
+  Squares are stored in flat bytearrays (index row * columns + column): mines, counts and square_states.
+  openings holds every opening's squares and opening_labels the opening number of every zero (see index_openings).
+  three_bv, opening_count and island_count measure the board once its bombs are known (see measure_board)."""
+  __slots__ = ("subscribers", "rng", "seed", "running", "clicked", "game_won", "game_difficulty", "board_size", "bomb_count",
+               "flag_count", "uncover_count", "mines", "counts", "square_states", "opening_labels", "openings",
+               "three_bv", "opening_count", "islands", "start_time", "end_time")
+
+  # Board symbols
+  BOMB_IDENTIFIER = "⬤"
+
+  # Square states and difficulty options
+  state_options = ("covered", "uncovered", "flagged", "incorrect_flagged")
+  difficulties = {
+    "easy" : {
+      "board_size" : (8,8),
+      "bomb_count" : 10,
+    },
+
+    "intermediate" : {
+      "board_size" : (16,16),
+      "bomb_count" : 40,
+    },
+
+    "expert" : {
+      "board_size" : (16,30),
+      "bomb_count" : 99,
+    } ,
+
+    "custom" : {
+      "board_size" : [10,10],
+      "bomb_count" : 30,
+    }
+  }
+
+  # Square state codes stored in square_states (their index in state_options)
+  COVERED, UNCOVERED, FLAGGED, INCORRECT_FLAGGED = range(4)
+
+  # Events sent to subscribers - callback(event, *args)
+  SQUARES_CHANGED = "squares_changed" # args: squares (collection of (row, column))
+  FLAGS_EXCEEDED = "flags_exceeded"   # no args
+  GAME_OVER = "game_over"             # args: is_win
+  MOVE_MADE = "move_made"             # args: new_state, square (sent for every move on a running game, before SQUARES_CHANGED)
+
+  # Squares around the first click (in each direction) that never contain a bomb
+  safe_radius = 1
+
+  # Variables that make up a game, other than the squares (written to and read from save files)
+  save_variables = ("running", "clicked", "game_won", "game_difficulty", "board_size", "bomb_count",
+                    "flag_count", "uncover_count", "start_time", "end_time")
+
+  def __init__(self):
+    """ Sets up the list of subscribers. Games that aren't generated from a seed (loaded games) have no seed."""
+    self.subscribers = []
+    self.seed = None
+
+    # Not measured until the board has bombs
+    self.three_bv = None
+    self.opening_count = None
+    self.islands = None
+
+  @classmethod
+  def difficulty_for(cls, board_size, bomb_count):
+    """ Returns the difficulty with the given board size and bomb count, or custom if none has (the custom settings are left
+    alone - NewEngine takes the board size and bomb count of other boards)."""
+    for difficulty, settings in cls.difficulties.items():
+      if tuple(settings["board_size"]) == tuple(board_size) and settings["bomb_count"] == bomb_count:
+        return difficulty
+    return "custom"
+
+  @property
+  def board_code(self):
+    """ The shareable code of the board (None if it wasn't generated from a seed).
+    The same code and first click always give the same bombs."""
+    if self.seed is None:
+      return None
+    return encode_board_code(self.board_size, self.bomb_count, self.seed)
+
+  def subscribe(self, callback):
+    """ Adds a callback that is called with every event the engine sends."""
+    self.subscribers.append(callback)
+
+  def notify(self, event, *args):
+    """ Sends an event to every subscriber."""
+    for callback in self.subscribers:
+      callback(event, *args)
+
+  def square_state(self, row, column):
+    """ Returns the state code of a square."""
+    return self.square_states[row * self.board_size[1] + column]
+
+  def square_value(self, row, column):
+    """ Returns the bomb identifier if the square is a bomb, or its surrounding bomb count."""
+    index = row * self.board_size[1] + column
+    if self.mines[index]:
+      return self.BOMB_IDENTIFIER
+    return self.counts[index]
+
+  def save_data(self):
+    """ Returns a dictionary of the variables that make up the game, in the JSON save file layout."""
+    save_data = {variable : getattr(self, variable) for variable in self.save_variables}
+    save_data["states"] = self.legacy_states()
+    save_data["board"] = self.legacy_board()
+    return save_data
+
+  def load_data(self, save_data, mines, square_states, counts=None):
+    """ Sets up the game from the variables of a dictionary in the JSON save file layout and its squares as flat mine and
+    state code bytearrays (see save_format.verify_json). Counts are recalculated unless given."""
+    for variable in self.save_variables:
+      setattr(self, variable, save_data[variable])
+    self.board_size = tuple(self.board_size)
+    self.load_squares(mines, square_states, counts)
+
+  def legacy_states(self):
+    """ Returns the square states as a 2D dictionary of state option strings."""
+    rows, columns = self.board_size
+    return {i : {j : self.state_options[self.square_states[i * columns + j]] for j in range(columns)} for i in range(rows)}
+
+  def legacy_board(self):
+    """ Returns the board as a 2D list of bomb counts and bomb identifiers (None before bombs are placed)."""
+    rows, columns = self.board_size
+    if not self.clicked:
+      return [[None] * columns for i in range(rows)]
+    return [[self.square_value(i, j) for j in range(columns)] for i in range(rows)]
+
+  def load_squares(self, mines, square_states, counts=None):
+    """ Sets the squares from flat mine and state code bytearrays. Counts are recalculated unless given."""
+    self.mines = mines
+    self.square_states = square_states
+    self.counts = counts if counts is not None else bomb_counts(self.mines, self.board_size)
+    self.index_openings()
+    self.measure_board()
+
+  def move(self, new_state, square):
+    """ Changes the state of the given square if it's a legal move."""
+    self.apply_moves(((new_state, square),))
+
+  def apply_moves(self, moves):
+    """ Makes a sequence of (new_state, (row, column)) moves, ignoring illegal ones (and every move after the game ends).
+    Every move is applied before anything is redrawn - subscribers get a MOVE_MADE event for each move, then one
+    SQUARES_CHANGED event with every square the moves changed. Returns the set of changed squares."""
+    changed = set()
+    for new_state, square in moves:
+      self.make_move(new_state, square, changed)
+
+    if changed:
+      self.notify(self.SQUARES_CHANGED, changed)
+    return changed
+
+  def make_move(self, new_state, square, changed):
+    """ Makes one move of a batch, adding the squares it changes to the changed set instead of sending them."""
+    # If the game is over
+    if not self.running:
+      return
+
+    index = square[0] * self.board_size[1] + square[1]
+    state = self.square_states[index]
+
+    # To uncover a square - only works if previously covered
+    if state == self.COVERED and new_state == self.state_options[1]:
+
+      # If it's the first uncovering click of a new board - place bombs
+      if not self.clicked:
+        self.place_bombs(square)
+        self.place_bomb_counts()
+        self.clicked = True
+
+      # Uncovers square
+      self.square_states[index] = self.UNCOVERED
+      self.uncover_count -= 1
+      changed.add(tuple(square))
+
+      # If it's a bomb, end game,
+      if self.mines[index]:
+        self.end_game(False, changed)
+
+      # Not a bomb
+      else:
+        # If the uncovered square was a zero, uncover its surroundings too
+        if self.counts[index] == 0:
+          changed |= self.uncover_zeros(square)
+
+        # If all squares are uncovered, end game.
+        if self.uncover_count == 0:
+          self.end_game(True, changed)
+
+    # To flag a square
+    if new_state == self.state_options[2]:
+
+      # If it's covered, flag it
+      if state == self.COVERED:
+        self.square_states[index] = self.FLAGGED
+        self.flag_count -= 1
+        changed.add(tuple(square))
+
+        # Warns user if they no longer have flags
+        if self.flag_count == -1:
+          self.notify(self.FLAGS_EXCEEDED)
+
+      # If it's flagged, cover it (remove flag)
+      elif state == self.FLAGGED:
+        self.square_states[index] = self.COVERED
+        self.flag_count += 1
+        changed.add(tuple(square))
+
+    self.notify(self.MOVE_MADE, new_state, square)
+
+  def chord(self, square):
+    """ Uncovers every covered neighbour of an uncovered number with as many flags around it as its count, as one batch
+    of moves (a wrong flag loses the game). Returns the set of changed squares (empty if the number isn't satisfied)."""
+    index = square[0] * self.board_size[1] + square[1]
+    if not self.running or self.square_states[index] != self.UNCOVERED or self.counts[index] == 0:
+      return set()
+
+    surrounding = neighbours(self.board_size)[index]
+    states = self.square_states
+    if sum(states[neighbour] == self.FLAGGED for neighbour in surrounding) != self.counts[index]:
+      return set()
+
+    columns = self.board_size[1]
+    return self.apply_moves([(self.state_options[1], divmod(neighbour, columns)) for neighbour in surrounding
+                             if states[neighbour] == self.COVERED])
+
+  def find_opening(self, start):
+    """ Given the flat index of a zero, returns its opening - the set of connected zeros and the squares around them -
+    and the set of zeros in it."""
+    surrounding = neighbours(self.board_size)
+    counts = self.counts
+
+    # Stack instead of recursion - no recursion limit
+    opening = {start}
+    zeros = {start}
+    stack = [start]
+    while stack:
+
+      # For every square surrounding the zero
+      for index in surrounding[stack.pop()]:
+        opening.add(index)
+
+        # If there is a zero surrounding the zero, its surroundings are in the opening too (bombs always count themselves)
+        if counts[index] == 0 and index not in zeros:
+          zeros.add(index)
+          stack.append(index)
+
+    return opening, zeros
+
+  def index_openings(self):
+    """ Labels every opening once the counts are known, so a zero click finds its opening in one lookup.
+    Boards too big for a neighbour table are not indexed - their openings are found when clicked."""
+    if len(self.counts) > NEIGHBOUR_TABLE_MAX_SQUARES:
+      self.opening_labels = None
+      self.openings = None
+      return
+
+    # Opening number of every zero (-1 for other squares) and the squares in each opening
+    self.opening_labels = array("i", [-1]) * len(self.counts)
+    self.openings = []
+
+    # For every zero that isn't in an opening yet
+    index = self.counts.find(0)
+    while index != -1:
+      if self.opening_labels[index] == -1:
+        opening, zeros = self.find_opening(index)
+        for zero in zeros:
+          self.opening_labels[zero] = len(self.openings)
+        self.openings.append(tuple(opening))
+
+      index = self.counts.find(0, index + 1)
+
+  def reindex_openings(self, changed):
+    """ Indexes the openings again around squares whose counts changed (bombs moved after the board was indexed), instead
+    of the whole board. Only openings with a zero at or next to a changed square can have changed."""
+    if self.opening_labels is None:
+      return
+    surrounding = neighbours(self.board_size)
+    labels = self.opening_labels
+    counts = self.counts
+
+    # Openings that changed, and zeros to index from - every zero near a changed square
+    stale = set()
+    starts = []
+    for index in changed:
+      for square in (index, *surrounding[index]):
+        if labels[square] != -1:
+          stale.add(labels[square])
+        if counts[square] == 0:
+          starts.append(square)
+
+    # The changed openings' zeros are unlabelled (those still zeros are indexed again)
+    for label in stale:
+      for index in self.openings[label]:
+        if labels[index] == label:
+          labels[index] = -1
+          if counts[index] == 0:
+            starts.append(index)
+
+    # New openings take the changed openings' numbers first
+    free = sorted(stale, reverse=True)
+    for start in starts:
+      if labels[start] == -1:
+        opening, zeros = self.find_opening(start)
+        label = free.pop() if free else len(self.openings)
+        if label == len(self.openings):
+          self.openings.append(None)
+        self.openings[label] = tuple(opening)
+        for zero in zeros:
+          labels[zero] = label
+
+    # Numbers still free are filled by the last openings, so openings are numbered 0 to len(openings) - 1
+    free = set(free)
+    while free:
+      last = len(self.openings) - 1
+      if last in free:
+        free.remove(last)
+      else:
+        label = min(free)
+        free.remove(label)
+        self.openings[label] = self.openings[last]
+        for index in self.openings[label]:
+          if labels[index] == last:
+            labels[index] = label
+      self.openings.pop()
+
+  def measure_board(self):
+    """ Works out the board's 3BV (the fewest clicks that clear it - one per opening, plus one per number outside every
+    opening) and its opening count. Linear in board size. Boards too big to index their openings are not measured (None)."""
+    self.islands = None
+    if self.openings is None:
+      self.three_bv = self.opening_count = None
+      return
+
+    self.opening_count = len(self.openings)
+    self.three_bv = self.opening_count + self.outside_openings().count(0)
+
+  def outside_openings(self):
+    """ Returns bytes with a 0 for every number outside every opening (each needs its own click).
+    Squares uncovered by clicking an opening are the ones with a zero in their 3x3 block - counted like bombs."""
+    near_zeros = bomb_counts(self.counts.translate(ZERO_TABLE), self.board_size)
+    return (int.from_bytes(self.mines, "big") | int.from_bytes(near_zeros, "big")).to_bytes(len(near_zeros), "big")
+
+  @property
+  def island_count(self):
+    """ The board's island count - groups of touching numbers outside every opening (None if the board isn't measured).
+    Counted by a flood fill the first time it is needed, as it is the slowest measure."""
+    if self.islands is None and self.three_bv is not None:
+      surrounding = neighbours(self.board_size)
+      seen = bytearray(self.outside_openings())
+      self.islands = 0
+      index = seen.find(0)
+      while index != -1:
+        self.islands += 1
+        seen[index] = 1
+        stack = [index]
+        while stack:
+          for neighbour in surrounding[stack.pop()]:
+            if not seen[neighbour]:
+              seen[neighbour] = 1
+              stack.append(neighbour)
+        index = seen.find(0, index + 1)
+    return self.islands
+
+  def uncover_zeros(self, move):
+    """ Given the index of a zero on the board, uncovers the opening around it. Returns the set of uncovered squares."""
+    columns = self.board_size[1]
+    states = self.square_states
+    start = move[0] * columns + move[1]
+
+    # Finds the whole opening before changing anything (indexed when the bombs were placed, if the board isn't too big)
+    if self.opening_labels is not None:
+      opening = self.openings[self.opening_labels[start]]
+    else:
+      opening = self.find_opening(start)[0]
+    revealed = [index for index in opening if states[index] != self.UNCOVERED]
+
+    # Uncovers the opening in one batch
+    for index in revealed:
+
+      # If the uncovered square was a flag, increase remaining flags by one
+      if states[index] == self.FLAGGED:
+        self.flag_count += 1
+
+      states[index] = self.UNCOVERED
+      self.uncover_count -= 1
+
+    return {divmod(index, columns) for index in revealed}
+
+  def end_game(self, is_win, changed=None):
+    """ Reveals the bombs to the player and ends the game. The revealed squares are added to the changed set of the move
+    that ended the game, or sent in one SQUARES_CHANGED event if there isn't one."""
+    # Ends game
+    self.running = False
+    self.game_won = is_win
+    self.end_time = time.time()
+
+    # Sends game end event
+    self.notify(self.GAME_OVER, is_win)
+
+    if not is_win:
+      columns = self.board_size[1]
+      states = self.square_states
+      mines = int.from_bytes(self.mines, "big")
+
+      # Covered bombs are uncovered and flags on non-bombs are marked incorrect - each adds one to its square's state, so the
+      # whole board changes in one big integer addition
+      uncovered_bombs = int.from_bytes(states.translate(ZERO_TABLE), "big") & mines
+      incorrect_flags = int.from_bytes(states.translate(FLAG_TABLE), "big") & ~mines
+      changes = uncovered_bombs | incorrect_flags
+      states[:] = (int.from_bytes(states, "big") + changes).to_bytes(len(states), "big")
+
+      # Squares with a change (compress keeps the indices of the 1 bytes)
+      revealed = list(map(divmod, compress(range(len(states)), changes.to_bytes(len(states), "big")), repeat(columns)))
+
+      if changed is not None:
+        changed.update(revealed)
+      elif revealed:
+        self.notify(self.SQUARES_CHANGED, revealed)
+
+
+class NewEngine(Engine):
+  """ Creates a new Minesweeper game using the Engine class. Boards prepared before the first click (see prepare) have
+  their scattered bombs counted already - prepared is the random state before scattering, the bomb table used and the
+  number of bombs scattered, and changed_bombs the (removed, added) bomb indices the first click recounts around."""
+  __slots__ = ("prepared", "changed_bombs")
+
+  def __init__(self, difficulty, rng=None, seed=None, board_size=None, bomb_count=None):
+    """ Sets up board and board variables. Bombs are placed by a random.Random seeded with seed (a new random seed if None),
+    unless a random.Random-like rng is given instead (the board then has no board code).
+    The board size and bomb count are the difficulty's unless given (see difficulty_for)."""
+    super().__init__()
+
+    # Random number generator for bomb placement - the same seed gives the same board again
+    if rng is None:
+      self.seed = seed if seed is not None else random.getrandbits(SEED_BITS)
+      rng = random.Random(self.seed)
+    self.rng = rng
+
+    # Booleans for significant events
+    self.running = True
+    self.clicked = False
+    self.game_won = None
+
+    # Board variables
+    self.game_difficulty = difficulty
+    settings = self.difficulties[self.game_difficulty]
+    self.board_size = tuple(settings["board_size"] if board_size is None else board_size)
+    self.bomb_count = settings["bomb_count"] if bomb_count is None else bomb_count
+    self.flag_count = self.bomb_count
+
+    # Non-bombs left to uncover
+    square_count = self.board_size[0] * self.board_size[1]
+    self.uncover_count = square_count - self.bomb_count
+
+    # Board setup - no bombs or counts until the first click, every square covered
+    self.mines = bytearray(square_count)
+    self.counts = bytearray(square_count)
+    self.square_states = bytearray(square_count)
+    self.opening_labels = None
+    self.openings = None
+    self.prepared = None
+    self.changed_bombs = None
+
+    # Gets start time of game
+    self.start_time = time.time()
+    self.end_time = None
+
+  def prepare(self):
+    """ Scatters the bombs for a first click in the middle of the board before it is made, then counts them and indexes the
+    openings - the slow part of the first click. Can run on a background thread while nothing else uses the game yet.
+    rng needs random.Random's getstate and setstate methods too."""
+    rows, columns = self.board_size
+    zone = safe_zone(self.board_size, self.bomb_count, (rows // 2, columns // 2), self.safe_radius)
+    table = mine_table(self.board_size, self.bomb_count, (zone[1] - zone[0]) * (zone[3] - zone[2]))
+
+    state = self.rng.getstate()
+    self.mines = scatter_mines(self.board_size, table, self.rng)
+    self.prepared = (state, table, self.mines.count(1))
+    self.counts = bomb_counts(self.mines, self.board_size)
+    self.index_openings()
+
+  def use_prepared(self, prepared):
+    """ Takes the seed and bombs of another new game of the same board, prepared before it was needed.
+    Raises ValueError if it isn't prepared or its board is different."""
+    if prepared.prepared is None or prepared.board_size != self.board_size or prepared.bomb_count != self.bomb_count:
+      raise ValueError("Prepared game does not match this board")
+
+    self.seed, self.rng, self.prepared = prepared.seed, prepared.rng, prepared.prepared
+    self.mines, self.counts = prepared.mines, prepared.counts
+    self.opening_labels, self.openings = prepared.opening_labels, prepared.openings
+
+  def place_bombs(self, square):
+    """ Places bomb_count bombs in the empty board, none within safe_radius of the first clicked square (the same bombs as
+    place_mines gives). Prepared boards only clear the safe zone and settle the bomb count, unless the click's safe zone
+    needs a different bomb table (a click at the edge of some boards) - then they are scattered again from the start."""
+    zone = safe_zone(self.board_size, self.bomb_count, square, self.safe_radius)
+    table = mine_table(self.board_size, self.bomb_count, (zone[1] - zone[0]) * (zone[3] - zone[2]))
+
+    if self.prepared is not None and self.prepared[1] != table:
+      self.rng.setstate(self.prepared[0])
+      self.prepared = None
+    placed = None
+    if self.prepared is None:
+      self.mines = scatter_mines(self.board_size, table, self.rng)
+    else:
+      placed = self.prepared[2]
+    self.changed_bombs = settle_mines(self.mines, self.board_size, self.bomb_count, zone, self.rng, placed)
+
+  def get_surrounding_bombs(self, row, column):
+    """ Gets the surrounding bomb count for a given index."""
+    index = row * self.board_size[1] + column
+
+    # The square itself only adds to the count if it is a bomb
+    return self.mines[index] + sum(self.mines[neighbour] for neighbour in neighbours(self.board_size)[index])
+
+  def place_bomb_counts(self):
+    """ Every square's surrounding bomb count is calculated (bombs count themselves), then the openings are indexed and
+    the board is measured. Prepared boards are only counted again around the bombs the first click changed."""
+    changed_count = sum(map(len, self.changed_bombs))
+    if self.prepared is None or 9 * changed_count * RECOUNT_SHARE > len(self.mines):
+      self.counts = bomb_counts(self.mines, self.board_size)
+      self.index_openings()
+    else:
+      self.recount_changed_bombs()
+    self.prepared = None
+    self.measure_board()
+
+  def recount_changed_bombs(self):
+    """ Updates the counts in the 3x3 block around every removed and added bomb, then the openings around them."""
+    rows, columns = self.board_size
+    counts = self.counts
+    removed, added = self.changed_bombs
+    changed = set()
+    for bombs, change in ((removed, -1), (added, 1)):
+      for index in bombs:
+        row, column = divmod(index, columns)
+        left, right = max(0, column - 1), min(columns, column + 2)
+        for i in range(max(0, row - 1), min(rows, row + 2)):
+          for square in range(i * columns + left, i * columns + right):
+            counts[square] += change
+            changed.add(square)
+
+    if changed:
+      self.reindex_openings(changed)
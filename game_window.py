@@ -9,21 +9,52 @@ from tkinter import ttk
 from tkinter import filedialog
 from tkinter import messagebox
 from tkinter import colorchooser
+from tkinter import simpledialog
 from board import NewBoard
+from board import NoGuessBoard
 from board import LoadBoard
+from board import ReplayBoard
 from board import Board
+from engine import NewEngine
+from engine import decode_board_code
+from journal import Journal
+from journal import JOURNAL_PATH
+from replay import Recording
+from stats_store import StatsStore
+import instrumentation
 import json
+import os
+import replay
+import save_format
+import sqlite3
+import threading
 import time
 
 class GameWindow:
   """ Window for Minesweeper game. Contains menubar with File, Game, and Settings menu. Uses Board classes for game handling."""
-  
-  def __init__(self, initial_difficulty):
-    """ Makes a board instance and outputs it."""
+  # Max board dimensions (boards bigger than the window are scrolled)
+  MAX_ROWS = 2000
+  MAX_COLUMNS = 2000
+
+  # Replay playback speeds
+  REPLAY_SPEEDS = (0.5, 1, 2, 4, 8, 16)
+
+  # Kinds of move whose click to redraw latency is measured
+  CLICK_KINDS = ("reveal", "flood reveal", "chord", "flag", "game over")
+
+  def __init__(self, initial_difficulty, no_guess=False):
+    """ Makes a board instance and outputs it. New boards need no guessing if no_guess is True."""
     
     # Saves window
     self.window = tk.Tk()
     self.window.resizable(height=False, width=False)
+
+    # Whether new boards can be solved without guessing, and whether hot paths are timed (see instrumentation)
+    self.no_guess = tk.BooleanVar(self.window, no_guess)
+    self.instrumented = tk.BooleanVar(self.window, instrumentation.enabled)
+
+    # Time from each click to the board being redrawn, by kind of move
+    self.click_latencies = instrumentation.Latencies()
     
     # Menubar for game window
     self.menubar = tk.Menu(self.window)
@@ -34,8 +65,24 @@ class GameWindow:
     self.game_frame = tk.Frame(self.window)
     self.game_frame.pack()
     
-    # Sets up a new board object with difficulty (and updates window title)
-    self.board = NewBoard(initial_difficulty, self.game_frame)
+    # Offers to restore the last unfinished game, otherwise sets up a new board object with difficulty
+    self.board = self.restored_board()
+    if self.board is None:
+      board_class = NoGuessBoard if no_guess else NewBoard
+      self.board = board_class(initial_difficulty, self.game_frame)
+
+    # Every finished game is kept in the stats store (stats are best effort - the game goes on without them)
+    try:
+      self.stats_store = StatsStore()
+    except (sqlite3.Error, OSError):
+      self.stats_store = None
+
+    # Next new board, prepared in the background - (board size and bomb count, game, thread) or None
+    self.next_board = None
+
+    # Autosaves, records and follows the board (and updates window title)
+    self.journal = Journal()
+    self.follow_board()
     self.set_title()
 
     # Gets the time of the game starting
@@ -48,6 +95,81 @@ class GameWindow:
     # Starts window
     self.window.mainloop()
     
+  def follow_board(self):
+    """ Autosaves and records the current board, times its clicks and keeps its result in the stats store when it ends."""
+    board = self.board
+    self.journal.start(board)
+    self.recording = Recording(board)
+    board.click_handler = self.timed_click
+    board.subscribe(lambda event, *args: self.handle_board_event(board, event, *args))
+
+    # Result of the game once it ends (game_won is reset once wins are counted in update_wins)
+    self.game_result = None
+
+    # The next game is likely the same difficulty
+    self.prepare_next_board()
+
+  def prepare_next_board(self):
+    """ Prepares a new game of the current difficulty on a background thread (see NewEngine.prepare), so the next new
+    game's first click only has to settle the bombs near it. No guessing boards are found on the first click instead."""
+    settings = Board.difficulties.get(self.board.game_difficulty)
+    if self.no_guess.get() or settings is None:
+      return
+
+    key = (tuple(settings["board_size"]), settings["bomb_count"])
+    if self.next_board is not None and self.next_board[0] == key:
+      return
+
+    game = NewEngine(self.board.game_difficulty)
+    thread = threading.Thread(target=game.prepare, daemon=True)
+    thread.start()
+    self.next_board = (key, game, thread)
+
+  def use_next_board(self):
+    """ Gives the current (new) board the bombs prepared for the next game, if they are for its size and bomb count and
+    are ready. Boards still being prepared are kept for the game after (the new board places its own bombs, so the main
+    loop never waits for the thread)."""
+    if self.next_board is None:
+      return
+    key, game, thread = self.next_board
+    if key != (self.board.board_size, self.board.bomb_count) or thread.is_alive():
+      return
+
+    self.next_board = None
+    try:
+      self.board.use_prepared(game)
+    except ValueError:
+      pass
+
+  def handle_board_event(self, board, event, *args):
+    """ Keeps the current board's result and records its game in the stats store on the move that ends it."""
+    if board is not self.board or event != board.MOVE_MADE or board.running:
+      return
+
+    self.game_result = board.game_won
+    if self.stats_store is None:
+      return
+
+    # Clicks made on this board (games restored or loaded count the clicks since)
+    try:
+      self.stats_store.record_engine(board, board.click_count)
+    except sqlite3.Error:
+      self.stats_store = None
+
+  def restored_board(self):
+    """ Returns the last unfinished game from the autosave journal if the user wants it, otherwise None."""
+    if not os.path.exists(JOURNAL_PATH):
+      return None
+
+    if not messagebox.askyesno(title="Restore Game", message="Your last game was not finished. Restore it?"):
+      return None
+
+    # If restoring failed (error message is handled in LoadBoard)
+    board = LoadBoard(self.game_frame, JOURNAL_PATH)
+    if not board.loaded:
+      return None
+    return board
+
   def set_title(self):
     """ Sets the title of the window based on the difficulty."""
     self.window.title(f"Minesweeper - {self.board.game_difficulty.capitalize()}")
@@ -59,6 +181,9 @@ class GameWindow:
     self.menubar.add_cascade(label="File", menu=file_menu)  
     file_menu.add_command(label="Open", command=self.load_game)
     file_menu.add_command(label="Save", command=self.save_game)
+    file_menu.add_separator()
+    file_menu.add_command(label="Save Replay", command=self.save_replay)
+    file_menu.add_command(label="Watch Replay", command=self.replay_window)
 
     # Game menu setup
     self.game_menu()
@@ -81,6 +206,14 @@ class GameWindow:
       new_game_menu.add_command(label=game_difficulty.capitalize(), command=
                                 lambda difficulty=game_difficulty: self.new_game(difficulty))
 
+    # Boards that can be solved from the first click without guessing
+    new_game_menu.add_separator()
+    new_game_menu.add_checkbutton(label="No Guessing", variable=self.no_guess)
+
+    # Board codes - replay a shared board, or share this one
+    game_menu.add_command(label="New From Board Code", command=self.board_code_game)
+    game_menu.add_command(label="Copy Board Code", command=self.copy_board_code)
+
     # Stats window
     game_menu.add_command(label="Stats", command=self.stats_window_output)
     
@@ -89,6 +222,10 @@ class GameWindow:
 
     def stats_update():
       """ Updates the stats in the stats_window."""
+      # Clears the stats from the last update
+      for widget in stats_window.winfo_children():
+        widget.destroy()
+
       # Updates Wins and Losses
       self.update_wins()
   
@@ -99,6 +236,11 @@ class GameWindow:
         "Board Size" : f"{self.board.board_size[0]}x{self.board.board_size[1]}",
         "Bombs" : self.board.bomb_count,
         "Remaining Flags" : self.board.flag_count,
+        "3BV" : "-",
+        "Openings" : "-",
+        "Islands" : "-",
+        "3BV/s" : "-",
+        "Efficiency" : "-",
         "Game Time" : None,  
         "Session Time": self.time_between(self.session_start, time.time()),
         "Session Wins" : self.win_count,
@@ -106,6 +248,18 @@ class GameWindow:
         "Win/Loss Ratio" : None 
       }
       
+      # Board measures once the bombs are placed (boards too big to measure have none)
+      if self.board.three_bv is not None:
+        stats["3BV"] = self.board.three_bv
+        stats["Openings"] = self.board.opening_count
+        stats["Islands"] = self.board.island_count
+
+        # 3BV per second and per click of won games (clicks are only all known if the recording saw the whole game)
+        if self.game_result and self.board.end_time > self.board.start_time:
+          stats["3BV/s"] = round(self.board.three_bv / (self.board.end_time - self.board.start_time), 2)
+          if self.recording.start is None and self.board.click_count:
+            stats["Efficiency"] = f"{self.board.three_bv / self.board.click_count:.0%}"
+
       # Set game time (\n to separate Game and Sessions stats)
       if self.board.running:
         stats["Game Time"] = self.time_between(self.board.start_time, time.time())
@@ -127,6 +281,11 @@ class GameWindow:
       # Refresh button to refresh stats again - outputted a row after the stats
       tk.Button(stats_window, text="Refresh", command=stats_update).grid(row=i + 1)
 
+      # All-time stats of this board, click latencies and timings of the game's hot paths
+      self.all_time_output(stats_window, i + 2)
+      self.latencies_output(stats_window, i + 3)
+      self.timings_output(stats_window, i + 4, stats_update)
+
     # New top level window 
     stats_window = tk.Toplevel()
     stats_window.title("Stats")
@@ -134,6 +293,134 @@ class GameWindow:
     stats_window.resizable(height=False, width=False)
     stats_update()
 
+  def all_time_output(self, stats_window, row):
+    """ Outputs the all-time stats of the current board's difficulty, size and bomb count from the given row - games and
+    wins, best and typical winning times, and win streaks (each an indexed query of the stats store)."""
+    frame = tk.Frame(stats_window)
+    frame.grid(row=row, sticky=tk.W)
+    tk.Label(frame, text="\nAll-Time (this board)", anchor=tk.W).grid(row=0, sticky=tk.W)
+
+    if self.stats_store is None:
+      tk.Label(frame, text="Stats store unavailable", anchor=tk.W).grid(row=1, sticky=tk.W)
+      return
+
+    key = (self.board.game_difficulty, self.board.board_size, self.board.bomb_count)
+    try:
+      games, wins = self.stats_store.results(*key)
+      best_times = self.stats_store.best_times(*key)
+      median_time, slow_time = self.stats_store.time_percentiles(*key)
+      current_streak = self.stats_store.current_streak(*key)
+      best_streak = self.stats_store.best_streak(*key)
+    except sqlite3.Error:
+      tk.Label(frame, text="Stats store unavailable", anchor=tk.W).grid(row=1, sticky=tk.W)
+      return
+
+    stats = {
+      "Games" : games,
+      "Wins" : f"{wins} ({wins / games:.0%})" if games else 0,
+      "Best Times" : ", ".join(f"{best_time:.1f}s" for best_time in best_times) or "-",
+      "Median Win Time" : f"{median_time:.1f}s" if median_time is not None else "-",
+      "90th Percentile Win Time" : f"{slow_time:.1f}s" if slow_time is not None else "-",
+      "Current Streak" : current_streak,
+      "Best Streak" : best_streak,
+    }
+    for i, statistic in enumerate(stats):
+      tk.Label(frame, text=f"{statistic}: {stats[statistic]}", anchor=tk.W).grid(row=i + 1, sticky=tk.W)
+
+  def timed_click(self, board, new_state, square):
+    """ Makes the move of a click on the board, recording the time until it is redrawn by the kind of move it made.
+    Clicks that change nothing aren't recorded."""
+    start = time.perf_counter()
+    running, uncover_count, flag_count = board.running, board.uncover_count, board.flag_count
+    board.click_move(new_state, square)
+    self.window.update_idletasks()
+    latency = time.perf_counter() - start
+
+    if running and not board.running:
+      kind = "game over"
+    elif new_state == board.CHORD and uncover_count != board.uncover_count:
+      kind = "chord"
+    elif uncover_count - board.uncover_count > 1:
+      kind = "flood reveal"
+    elif uncover_count - board.uncover_count == 1:
+      kind = "reveal"
+    elif flag_count != board.flag_count:
+      kind = "flag"
+    else:
+      return
+    self.click_latencies.add(kind, latency)
+
+  def latencies_output(self, stats_window, row):
+    """ Outputs the click latencies section of the stats window from the given row - p50, p95 and p99 of the time from a
+    click to the board being redrawn, over the recent clicks of each kind of move."""
+    frame = tk.Frame(stats_window)
+    frame.grid(row=row, sticky=tk.W)
+    tk.Label(frame, text="\nClick Latency", anchor=tk.W).grid(row=0, sticky=tk.W)
+
+    for i, kind in enumerate(self.CLICK_KINDS):
+      text = f"{kind.capitalize()}: no clicks"
+      if kind in self.click_latencies.kinds:
+        p50, p95, p99 = (latency * 1000 for latency in self.click_latencies.percentiles(kind))
+        text = f"{kind.capitalize()}: p50 {p50:.1f}ms, p95 {p95:.1f}ms, p99 {p99:.1f}ms"
+      tk.Label(frame, text=text, anchor=tk.W).grid(row=i + 1, sticky=tk.W)
+
+    tk.Button(frame, text="Save Latencies", command=self.save_latencies).grid(row=len(self.CLICK_KINDS) + 1, sticky=tk.W)
+
+  def save_latencies(self):
+    """ Writes the click latencies to a JSON file."""
+    file_name = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON File", ".json")])
+    if not file_name:
+      return
+
+    try:
+      self.click_latencies.dump(file_name)
+    except OSError:
+      messagebox.showerror(title="File Error", message="Could not save latencies to file.")
+
+  def timings_output(self, stats_window, row, stats_update):
+    """ Outputs the timings section of the stats window from the given row - a switch to record timings, the timings
+    so far and buttons to save or clear them."""
+    frame = tk.Frame(stats_window)
+    frame.grid(row=row, sticky=tk.W)
+
+    def toggle():
+      """ Turns instrumentation on or off."""
+      if self.instrumented.get():
+        instrumentation.enable()
+      else:
+        instrumentation.disable()
+
+    def reset():
+      """ Clears the timings and outputs the stats again."""
+      instrumentation.reset()
+      stats_update()
+
+    tk.Label(frame, text="\nTimings", anchor=tk.W).grid(row=0, sticky=tk.W)
+    tk.Checkbutton(frame, text="Record timings", variable=self.instrumented, command=toggle).grid(row=1, sticky=tk.W)
+
+    # Every function called since timing started - calls, total time and percentiles (upper bounds of histogram buckets)
+    timed = [(name, timing) for name, timing in sorted(instrumentation.timings.items()) if timing.count]
+    for i, (name, timing) in enumerate(timed):
+      percentiles = ", ".join(f"p{percent} <{timing.percentile(percent / 100) * 1000:g}ms" for percent in (50, 95, 99))
+      tk.Label(frame, text=f"{name}: {timing.count} calls, {timing.total * 1000:.1f}ms total, {percentiles}",
+               anchor=tk.W).grid(row=i + 2, sticky=tk.W)
+
+    buttons = tk.Frame(frame)
+    buttons.grid(row=len(timed) + 2, sticky=tk.W)
+    tk.Button(buttons, text="Save Timings", command=self.save_timings).grid(row=0, column=0)
+    tk.Button(buttons, text="Clear Timings", command=reset).grid(row=0, column=1)
+
+  def save_timings(self):
+    """ Writes the timings of the game's hot paths to a JSON file."""
+    file_name = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON File", ".json")])
+    if not file_name:
+      return
+
+    try:
+      instrumentation.dump(file_name)
+    except OSError:
+      messagebox.showerror(title="File Error", message="Could not save timings to file.")
+
   def time_between(self, event_time, end_time):
     """ Returns the time passed for an event time in hours, seconds and minutes, given times in seconds."""
     # Time passed in seconds
@@ -145,17 +432,22 @@ class GameWindow:
 
     return f"{hours:02}:{minutes:02}:{seconds:02}"  
     
-  def new_game(self, difficulty):
-    """ Creates a new minesweeper game."""
+  def new_game(self, difficulty, seed=None, board_size=None, bomb_count=None):
+    """ Creates a new minesweeper game (the same board again for the seed, board size and bomb count of a board code).
+    Without a seed, the board needs no guessing if the No Guessing option is on."""
     # Updates wins and losses (if previous game was completed)
     self.update_wins()
     
-    # Clears game frame
-    self.game_frame.pack_forget()
+    # Destroys the old board's widgets
+    self.board.destroy()
 
     # Creates new game frame with new board
     self.game_frame = tk.Frame(self.window)
-    self.board = NewBoard(difficulty, self.game_frame)
+    board_class = NoGuessBoard if self.no_guess.get() and seed is None else NewBoard
+    self.board = board_class(difficulty, self.game_frame, seed, board_size, bomb_count)
+    if board_class is NewBoard and seed is None:
+      self.use_next_board()
+    self.follow_board()
     self.game_frame.pack() 
 
     # Changes window title
@@ -170,17 +462,19 @@ class GameWindow:
     # If loading failed
     # No error message as that is handled in LoadBoard
     if not new_board.loaded:
+      new_frame.destroy()
       return
     
     # Updates wins and losses (if previous game was completed)
     self.update_wins()
     
-    # Clears old game frame
-    self.game_frame.pack_forget()
+    # Destroys the old board's widgets
+    self.board.destroy()
 
     # Starts new game with loaded board
     self.game_frame = new_frame
     self.board = new_board
+    self.follow_board()
     self.game_frame.pack() 
     self.set_title()
     
@@ -195,27 +489,155 @@ class GameWindow:
       messagebox.showerror(title="Game Over", message="Cannot save game that has completed.")
       return
     
-    # Creates save file (.txt)
-    save_file = filedialog.asksaveasfile(defaultextension=".json", filetypes=[("JSON File", ".json")])
-    if save_file == None:
+    # Gets save file name - binary save file unless a JSON file is chosen
+    file_name = filedialog.asksaveasfilename(defaultextension=save_format.EXTENSION, 
+                                             filetypes=[("Minesweeper Save", save_format.EXTENSION), ("JSON File", ".json")])
+    if not file_name:
       return
     
     try:
-      # Gets board object without frame 
-      board_vars = vars(self.board)
-      temp_frame = board_vars.pop("frame")
-      
-      # Writes to the save_file
-      json.dump(board_vars, save_file)
-      save_file.close()
-
-      # Adds frame again
-      board_vars["frame"] = temp_frame
+      # Writes the game variables (no frame or subscribers) to the save file
+      if file_name.endswith(".json"):
+        with open(file_name, "w") as save_file:
+          json.dump(self.board.save_data(), save_file)
+      else:
+        save_format.save_binary(self.board, file_name)
 
     # If the file isn't saved, show an error message
-    except TypeError:
+    except (TypeError, OSError):
       messagebox.showerror(title="File Error", message="Could not save data to save file.")
 
+  def board_code_game(self):
+    """ Asks for a board code and starts a new game on its board."""
+    code = simpledialog.askstring(title="Board Code", prompt="Board code:", parent=self.window)
+    if not code:
+      return
+
+    try:
+      board_size, bomb_count, seed = decode_board_code(code)
+    except ValueError:
+      messagebox.showerror(title="Invalid board code", message="Board code is not valid.")
+      return
+
+    if board_size[0] > self.MAX_ROWS or board_size[1] > self.MAX_COLUMNS:
+      messagebox.showerror(title="Invalid board size", message=f"Board size must be between 1x1 and {self.MAX_ROWS}x{self.MAX_COLUMNS}.")
+      return
+
+    self.new_game(Board.difficulty_for(board_size, bomb_count), seed, board_size, bomb_count)
+
+  def copy_board_code(self):
+    """ Copies the current board's code to the clipboard and shows it."""
+    code = self.board.board_code
+    if code is None:
+      messagebox.showerror(title="No Board Code", message="Loaded games have no board code (and no guessing games have none until the first click).")
+      return
+
+    self.window.clipboard_clear()
+    self.window.clipboard_append(code)
+    messagebox.showinfo(title="Board Code", message=f"Copied board code:\n{code}\nThe same first click gives the same board.")
+
+  def save_replay(self):
+    """ Saves every move of the current game (with its time) to a replay file."""
+    if not self.board.clicked:
+      messagebox.showerror(title="Game Not Started", message="Cannot save replay of game that has not begun.")
+      return
+
+    file_name = filedialog.asksaveasfilename(defaultextension=replay.EXTENSION, filetypes=[("Minesweeper Replay", replay.EXTENSION)])
+    if not file_name:
+      return
+
+    try:
+      self.recording.save(file_name)
+    except (ValueError, OSError):
+      messagebox.showerror(title="File Error", message="Could not save data to replay file.")
+
+  def replay_window(self):
+    """ Plays a replay file back in a top level window, at any speed or from any move."""
+    file_name = filedialog.askopenfilename(filetypes=[("Minesweeper Replay", replay.EXTENSION)])
+    if not file_name:
+      return
+
+    # New top level window
+    window = tk.Toplevel()
+    window.title("Replay")
+    window.resizable(height=False, width=False)
+    board_frame = tk.Frame(window)
+    board_frame.pack()
+
+    try:
+      board = ReplayBoard(board_frame, *replay.load_replay(file_name))
+    except (ValueError, OSError) as error:
+      window.destroy()
+      messagebox.showerror(title="File Error", message=f"Invalid data. Please check your replay file.\n{error}")
+      return
+
+    # Playback state - whether it is playing and the pending after call
+    playback = {"playing" : False, "after" : None}
+    move_count = len(board.moves)
+
+    def seek(index):
+      """ Jumps to a move (from the slider)."""
+      board.seek(int(index))
+      move_label.config(text=f"Move {board.move_index}/{move_count}")
+
+    def play_next():
+      """ Waits the player's time for the next move (divided by the speed), then plays it."""
+      if not playback["playing"] or board.move_index >= move_count:
+        playback["playing"] = False
+        play_button.config(text="Play")
+        return
+
+      delay = board.move_delay(board.move_index) / float(speed.get())
+      playback["after"] = window.after(round(delay * 1000), step)
+
+    def step():
+      """ Plays the next move and schedules the one after it."""
+      slider.set(board.move_index + 1)
+      seek(board.move_index + 1)
+      play_next()
+
+    def toggle_play():
+      """ Starts or pauses playback (from the start again if the replay is over)."""
+      if playback["playing"]:
+        playback["playing"] = False
+        window.after_cancel(playback["after"])
+        play_button.config(text="Play")
+        return
+
+      if board.move_index >= move_count:
+        slider.set(0)
+        seek(0)
+      playback["playing"] = True
+      play_button.config(text="Pause")
+      play_next()
+
+    def close():
+      """ Stops playback and closes the window."""
+      if playback["after"] is not None:
+        window.after_cancel(playback["after"])
+      window.destroy()
+
+    # Playback controls - play/pause, speed, move slider and move number
+    controls = tk.Frame(window)
+    controls.pack()
+    play_button = tk.Button(controls, text="Play", width=6, command=toggle_play)
+    play_button.grid(row=0, column=0)
+
+    speed = tk.StringVar(controls, "1")
+    tk.OptionMenu(controls, speed, *self.REPLAY_SPEEDS).grid(row=0, column=1)
+    tk.Label(controls, text="x speed").grid(row=0, column=2)
+
+    slider = tk.Scale(controls, from_=0, to=move_count, orient=tk.HORIZONTAL, showvalue=False, length=200, command=seek)
+    slider.grid(row=1, columnspan=3)
+    move_label = tk.Label(controls, text=f"Move 0/{move_count}")
+    move_label.grid(row=2, columnspan=3)
+
+    # Board code of the replayed board, if it has one
+    if board.board_code is not None:
+      tk.Label(controls, text=f"Board code: {board.board_code}").grid(row=3, columnspan=3)
+
+    window.protocol("WM_DELETE_WINDOW", close)
+
   def settings_menu(self):
     """ Settings window from menubar."""
     # New top level window 
@@ -253,23 +675,33 @@ class GameWindow:
     def change_colour(colour_attribute):
       """ Changes color in board class based on users choice, given the changed attribute."""
       new_colour = colorchooser.askcolor(self.board.colours[colour_attribute])
+
+      # If the colour chooser was cancelled
+      if new_colour[1] is None:
+        return
+
       Board.colours[colour_attribute] = new_colour[1]
       self.board.output_board()
 
     def apply_height(new_height):
       """ Applies changes to height."""
-      self.board.square_dimensions[0] = new_height
+      self.board.square_dimensions[0] = int(new_height)
       self.board.output_board()
       
     def apply_width(new_width):
       """ Applies changes to width."""
-      self.board.square_dimensions[1] = new_width
+      self.board.square_dimensions[1] = int(new_width)
       self.board.output_board()
 
     def set_default_colours():
       """ Reverts to default colours (calls classmethod)."""
       Board.set_default_colours()
       self.board.output_board() 
+
+    def set_renderer(renderer):
+      """ Changes how the board is drawn."""
+      Board.renderer_choice = renderer
+      self.board.output_board()
       
     # Colours title
     self.settings_title(frame, "Colours").grid(row=0, columnspan=2)
@@ -308,6 +740,15 @@ class GameWindow:
     width_scale.set(self.board.square_dimensions[1])
     width_scale.grid(row=i + 6, columnspan=2)
 
+    # Renderer title (with new line before)
+    self.settings_title(frame, "\nRenderer").grid(row=i + 7, columnspan=2)
+
+    # One option for every renderer
+    renderer_choice = tk.StringVar(frame, Board.renderer_choice)
+    for j, renderer in enumerate(Board.renderers, start=i + 8):
+      tk.Radiobutton(frame, text=renderer.capitalize(), value=renderer, variable=renderer_choice, command=
+                     lambda: set_renderer(renderer_choice.get())).grid(row=j, columnspan=2)
+
   def game_settings(self, frame):
     """ Game settings in settings window."""
 
@@ -319,10 +760,15 @@ class GameWindow:
 
     def save_changes():
       """ Validates users input to bomb entry field."""
-      # Dimensions and bomb variables
-      rows = row_count.get()
-      columns = column_count.get()
-      bombs = int(bomb_input.get())
+      # Dimensions and bomb variables (empty fields count as zero)
+      rows = int(row_count.get() or 0)
+      columns = int(column_count.get() or 0)
+      bombs = int(bomb_input.get() or 0)
+
+      # Dimensions must be within the limits
+      if not 1 <= rows <= self.MAX_ROWS or not 1 <= columns <= self.MAX_COLUMNS:
+        messagebox.showerror(title="Invalid board size", message=f"Board size must be between 1x1 and {self.MAX_ROWS}x{self.MAX_COLUMNS}.")
+        return
       
       # There can't be more bombs than validsquares 
       # The game must uncover 4 to 9 squares minimum on first click 
@@ -355,29 +801,34 @@ class GameWindow:
       if new_game:
         self.new_game("custom")
 
-    # Max board dimensions
-    MAX_ROWS = 20
-    MAX_COLUMNS = 40
+    # Validation command for the number entry areas
+    validation_cmd = frame.register(validate_int)
     
     # Custom difficulty editor
     self.settings_title(frame, "Custom Difficulty").grid(row=0, columnspan=2)
 
     # Rows
     self.settings_header(frame, "Rows:").grid(row=1)
-    row_count = tk.Scale(frame,
-                         from_=1, 
-                         to=MAX_ROWS,
-                         orient=tk.HORIZONTAL,)
-    row_count.set(self.board.difficulties["custom"]["board_size"][0])
+    row_count = tk.Spinbox(frame,
+                           from_=1, 
+                           to=self.MAX_ROWS,
+                           width=8,
+                           validate="key",
+                           validatecommand=(validation_cmd, '%P'))
+    row_count.delete(0, tk.END)
+    row_count.insert(0, self.board.difficulties["custom"]["board_size"][0])
     row_count.grid(row=1, column=2)
 
     # Columns
     self.settings_header(frame, "Columns:").grid(row=2)
-    column_count = tk.Scale(frame,
-                         from_=1, 
-                         to=MAX_COLUMNS,
-                         orient=tk.HORIZONTAL,)
-    column_count.set(self.board.difficulties["custom"]["board_size"][1])
+    column_count = tk.Spinbox(frame,
+                              from_=1, 
+                              to=self.MAX_COLUMNS,
+                              width=8,
+                              validate="key",
+                              validatecommand=(validation_cmd, '%P'))
+    column_count.delete(0, tk.END)
+    column_count.insert(0, self.board.difficulties["custom"]["board_size"][1])
     column_count.grid(row=2, column=2)
 
     # Bombs
@@ -386,9 +837,6 @@ class GameWindow:
     text_frame.pack_propagate(0)
     text_frame.grid(row=3, column=2)
 
-    # Validation command
-    validation_cmd = text_frame.register(validate_int)
-
     # Bomb count text entry area
     self.settings_header(frame, "Bombs:").grid(row=3)
     bomb_input = tk.Entry(text_frame, validate="key", validatecommand=(validation_cmd, '%P'))
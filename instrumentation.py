@@ -0,0 +1,157 @@
+_author_ = "Asif Rahman"
+_date_ = "Saturday, October 17, 2026"
+_version_ = "1.0"
+_filename_ = "instrumentation.py"
+_description_ = "Minesweeper instrumentation. Times the game's hot paths when turned on - call counts, total time and latency histograms."
+
+from collections import deque
+import json
+import time
+
+# Histogram buckets - bucket n holds calls that took under 2 ** n microseconds (the last holds everything slower)
+BUCKETS = 32
+
+# Latencies kept of each kind for rolling percentiles
+ROLLING_LATENCIES = 1000
+
+
+class Timing:
+  """ Call count, total time and latency histogram of one instrumented function."""
+  __slots__ = ("count", "total", "histogram")
+
+  def __init__(self):
+    """ Sets up a timing with no calls."""
+    self.count = 0
+    self.total = 0.0
+    self.histogram = [0] * BUCKETS
+
+  def add(self, seconds):
+    """ Records a call that took seconds."""
+    self.count += 1
+    self.total += seconds
+    self.histogram[min(int(seconds * 1000000).bit_length(), BUCKETS - 1)] += 1
+
+  def percentile(self, fraction):
+    """ Returns the upper bound (in seconds) of the histogram bucket holding the given fraction of calls (0 to 1)."""
+    needed = fraction * self.count
+    seen = 0
+    for bucket, count in enumerate(self.histogram):
+      seen += count
+      if count and seen >= needed:
+        return 2 ** bucket / 1000000
+    return 0.0
+
+  def summary(self):
+    """ Returns the timing as a dictionary (for dump files)."""
+    return {
+      "count" : self.count,
+      "total_seconds" : self.total,
+      "mean_seconds" : self.total / self.count if self.count else 0.0,
+      "p50_seconds" : self.percentile(0.5),
+      "p95_seconds" : self.percentile(0.95),
+      "p99_seconds" : self.percentile(0.99),
+      "histogram_microseconds" : {f"<{2 ** bucket}" : count for bucket, count in enumerate(self.histogram) if count},
+    }
+
+
+class Latencies:
+  """ Rolling latencies of the last ROLLING_LATENCIES events of each kind (such as the kinds of move a click makes)."""
+
+  def __init__(self):
+    """ Sets up with no latencies."""
+    self.kinds = {}
+
+  def add(self, kind, seconds):
+    """ Records an event of a kind that took seconds (the oldest of the kind is dropped once there are enough)."""
+    if kind not in self.kinds:
+      self.kinds[kind] = deque(maxlen=ROLLING_LATENCIES)
+    self.kinds[kind].append(seconds)
+
+  def percentiles(self, kind, fractions=(0.5, 0.95, 0.99)):
+    """ Returns the latency (in seconds) at each fraction (0 to 1) of the kind's recent events."""
+    latencies = sorted(self.kinds[kind])
+    return [latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] for fraction in fractions]
+
+  def summary(self):
+    """ Returns the count and p50, p95 and p99 of every kind, as a dictionary (for dump files)."""
+    summary = {}
+    for kind, latencies in self.kinds.items():
+      p50, p95, p99 = self.percentiles(kind)
+      summary[kind] = {"count" : len(latencies), "p50_seconds" : p50, "p95_seconds" : p95, "p99_seconds" : p99}
+    return summary
+
+  def dump(self, path):
+    """ Writes the summary to a JSON file."""
+    with open(path, "w") as dump_file:
+      json.dump(self.summary(), dump_file, indent=2)
+
+
+# Timings of every instrumented function by name, and the functions replaced while instrumentation is on
+timings = {}
+originals = []
+enabled = False
+
+# Hot paths that can be timed - (name, class or module, attribute), added by the modules that own them
+hooks = []
+
+
+def add_hook(name, owner, attribute):
+  """ Adds a function to time when instrumentation is on (a method of a class, or a function of a module)."""
+  hooks.append((name, owner, attribute))
+
+
+def timed(name, function):
+  """ Returns function wrapped to record its time in timings[name]."""
+  timing = timings.setdefault(name, Timing())
+  perf_counter = time.perf_counter
+
+  def wrapper(*args, **kwargs):
+    start = perf_counter()
+    try:
+      return function(*args, **kwargs)
+    finally:
+      timing.add(perf_counter() - start)
+
+  wrapper.__name__ = function.__name__
+  wrapper.__doc__ = function.__doc__
+  wrapper.__wrapped__ = function
+  return wrapper
+
+
+def enable():
+  """ Starts timing every hook. Each hooked function is swapped for a timed one, so turned off it costs nothing."""
+  global enabled
+  if enabled:
+    return
+
+  for name, owner, attribute in hooks:
+    # Methods defined by a base class are timed on this class only (and removed again when turned off)
+    defined_here = attribute in vars(owner)
+    function = vars(owner)[attribute] if defined_here else getattr(owner, attribute)
+    originals.append((owner, attribute, function if defined_here else None))
+    setattr(owner, attribute, timed(name, function))
+  enabled = True
+
+
+def disable():
+  """ Stops timing (the timings so far are kept)."""
+  global enabled
+  while originals:
+    owner, attribute, function = originals.pop()
+    if function is None:
+      delattr(owner, attribute)
+    else:
+      setattr(owner, attribute, function)
+  enabled = False
+
+
+def reset():
+  """ Clears every timing."""
+  for timing in timings.values():
+    timing.__init__()
+
+
+def dump(path):
+  """ Writes the timing of every function called since timing started to a JSON file."""
+  with open(path, "w") as dump_file:
+    json.dump({name : timing.summary() for name, timing in sorted(timings.items()) if timing.count}, dump_file, indent=2)
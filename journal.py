@@ -0,0 +1,157 @@
+_author_ = "Asif Rahman"
+_date_ = "Saturday, October 17, 2026"
+_version_ = "1.0"
+_filename_ = "journal.py"
+_description_ = "Minesweeper autosave journal. A snapshot of the current game followed by a fixed-size record per move, replayed after a crash."
+
+import os
+import save_format
+import struct
+import time
+
+# File identifier, version and extension
+MAGIC = b"MSWJ"
+VERSION = 1
+EXTENSION = ".msj"
+
+# Where the autosave journal is kept
+JOURNAL_PATH = os.path.join(os.path.expanduser("~"), ".minesweeper", "autosave" + EXTENSION)
+
+# Header - magic, version and the size of the binary save snapshot that follows it
+HEADER = struct.Struct("<4sBQ")
+
+# Move record - state option index (1 uncover, 2 flag), row, column and time of the move
+RECORD = struct.Struct("<BIId")
+
+# Moves appended before the journal is compacted into a new snapshot
+COMPACT_EVERY = 500
+
+
+class Journal:
+  """ Append-only autosave of the current game. The snapshot is written after the first click (once bombs exist),
+  then every move costs one fixed-size record. Finished games remove the journal."""
+
+  def __init__(self, path=JOURNAL_PATH):
+    """ Sets up a journal that isn't following a board yet."""
+    self.path = path
+    self.board = None
+    self.file = None
+    self.record_count = 0
+
+  def start(self, board):
+    """ Follows a new current board. Games already in progress are snapshotted straight away."""
+    self.close()
+    self.board = board
+    board.subscribe(lambda event, *args: self.handle_event(board, event, *args))
+
+    try:
+      if board.clicked and board.running:
+        self.compact()
+      else:
+        self.remove()
+
+    # Autosave is best effort - the game goes on without it
+    except OSError:
+      self.stop()
+
+  def handle_event(self, board, event, *args):
+    """ Records moves made on the current board. Moves before the first click (flags on a board with no bombs yet) are
+    left to the snapshot the first click writes."""
+    if board is not self.board or event != board.MOVE_MADE or not board.clicked:
+      return
+
+    try:
+      # Game over - nothing to restore
+      if not board.running:
+        self.remove()
+
+      # First click - the snapshot includes the bombs (and any earlier flags), so the move doesn't need a record
+      elif self.file is None:
+        self.compact()
+
+      else:
+        self.append(*args)
+
+    # Autosave is best effort - the game goes on without it
+    except OSError:
+      self.stop()
+
+  def append(self, new_state, square):
+    """ Appends a move record, compacting the journal every COMPACT_EVERY moves."""
+    self.file.write(RECORD.pack(self.board.state_options.index(new_state), square[0], square[1], time.time()))
+    self.file.flush()
+    self.record_count += 1
+
+    if self.record_count >= COMPACT_EVERY:
+      self.compact()
+
+  def compact(self):
+    """ Rewrites the journal as a snapshot of the current game with no moves.
+    The new journal is written to a temporary file first, so a crash leaves either the old or the new one whole."""
+    self.close()
+    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+    snapshot = save_format.binary_save_data(self.board)
+
+    temporary_path = self.path + ".tmp"
+    with open(temporary_path, "wb") as journal_file:
+      journal_file.write(HEADER.pack(MAGIC, VERSION, len(snapshot)))
+      journal_file.write(snapshot)
+      journal_file.flush()
+      os.fsync(journal_file.fileno())
+    os.replace(temporary_path, self.path)
+
+    # Moves are appended from here
+    self.file = open(self.path, "ab")
+    self.record_count = 0
+
+  def remove(self):
+    """ Removes the journal file."""
+    self.close()
+    if os.path.exists(self.path):
+      os.remove(self.path)
+
+  def close(self):
+    """ Closes the journal file (it stays on disk)."""
+    if self.file is not None:
+      self.file.close()
+      self.file = None
+
+  def stop(self):
+    """ Stops journaling the current board."""
+    try:
+      self.close()
+    except OSError:
+      self.file = None
+    self.board = None
+
+
+def restore(engine, path=JOURNAL_PATH):
+  """ Loads the journal's snapshot into the engine and replays its moves. A record cut off by a crash is ignored.
+  Raises ValueError if the journal is not valid."""
+  with open(path, "rb") as journal_file:
+    data = journal_file.read()
+
+  if len(data) < HEADER.size:
+    raise ValueError("Journal header is incomplete")
+  magic, version, snapshot_size = HEADER.unpack_from(data)
+
+  if magic != MAGIC:
+    raise ValueError("Not a Minesweeper journal")
+  if version != VERSION:
+    raise ValueError(f"Unsupported journal version {version}")
+  if len(data) < HEADER.size + snapshot_size:
+    raise ValueError("Journal snapshot is incomplete")
+
+  # Snapshot, then every whole move record
+  save_format.load_binary_data(engine, memoryview(data)[HEADER.size : HEADER.size + snapshot_size])
+  records = data[HEADER.size + snapshot_size :]
+  records = records[: len(records) - len(records) % RECORD.size]
+
+  # Every move is checked before any is made, then they are made in one batch
+  rows, columns = engine.board_size
+  moves = []
+  for state, row, column, move_time in RECORD.iter_unpack(records):
+    if state not in (1, 2) or row >= rows or column >= columns:
+      raise ValueError("Invalid move in journal")
+    moves.append((engine.state_options[state], (row, column)))
+  engine.apply_moves(moves)
@@ -7,31 +7,55 @@ _description_ = "Minesweeper Game for Final Assignment. Contains initial window
 import tkinter as tk
 from board import Board
 from game_window import GameWindow
+import argparse
+import cProfile
+import instrumentation
 
 def set_difficulty(choice):
   """ Saves difficulty choice and starts game."""
   # Destroys difficulty choice window and starts game window
+  no_guess = no_guess_choice.get()
   initial_window.destroy()
-  GameWindow(choice.lower())
-
-# Window to contain widgets 
-initial_window = tk.Tk()
-initial_window.resizable(height=False, width=False)
-
-# Listbox to contain difficulty choices
-tk.Label(initial_window, text="Choose your initial difficulty:").pack()
-difficulty_listbox = tk.Listbox(initial_window)
-
-# Gives user the option of every difficulty
-for i, difficulty in enumerate(Board.difficulties):
-  difficulty_listbox.insert(i, difficulty.capitalize())
-difficulty_listbox.pack()
-
-# Submit button
-tk.Button(initial_window, text="Submit Choice", command=
-          lambda: set_difficulty(difficulty_listbox.get(difficulty_listbox.curselection()))).pack()
-
-# Waits on users input
-initial_window.mainloop()
-
-
+  GameWindow(choice.lower(), no_guess)
+
+# Only the first process shows the window (no guessing boards are generated in worker processes that import this one)
+if __name__ == "__main__":
+  # Launch options for finding out why the game is slow
+  parser = argparse.ArgumentParser(description="Minesweeper")
+  parser.add_argument("--profile", nargs="?", const="minesweeper.prof", metavar="FILE",
+                      help="profile the whole session with cProfile and write the stats to FILE (minesweeper.prof by default)")
+  parser.add_argument("--instrument", action="store_true", help="record timings of the game's hot paths from the start")
+  options = parser.parse_args()
+
+  if options.instrument:
+    instrumentation.enable()
+
+  # Window to contain widgets 
+  initial_window = tk.Tk()
+  initial_window.resizable(height=False, width=False)
+
+  # Listbox to contain difficulty choices
+  tk.Label(initial_window, text="Choose your initial difficulty:").pack()
+  difficulty_listbox = tk.Listbox(initial_window)
+
+  # Gives user the option of every difficulty
+  for i, difficulty in enumerate(Board.difficulties):
+    difficulty_listbox.insert(i, difficulty.capitalize())
+  difficulty_listbox.pack()
+
+  # Boards that can be solved without guessing, for any difficulty
+  no_guess_choice = tk.BooleanVar(initial_window, False)
+  tk.Checkbutton(initial_window, text="No guessing", variable=no_guess_choice).pack()
+
+  # Submit button
+  tk.Button(initial_window, text="Submit Choice", command=
+            lambda: set_difficulty(difficulty_listbox.get(difficulty_listbox.curselection()))).pack()
+
+  # Waits on users input (the game window runs inside this loop, so profiling it covers the whole session)
+  if options.profile:
+    profiler = cProfile.Profile()
+    profiler.runcall(initial_window.mainloop)
+    profiler.dump_stats(options.profile)
+    print(f"Profile written to {options.profile} (view with python -m pstats {options.profile})")
+  else:
+    initial_window.mainloop()
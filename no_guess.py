@@ -0,0 +1,158 @@
+_author_ = "Asif Rahman"
+_date_ = "Saturday, October 17, 2026"
+_version_ = "1.0"
+_filename_ = "no_guess.py"
+_description_ = "Minesweeper no guessing boards. Tries seeded boards on a process pool until one can be solved from the first click by logic alone."
+
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+from concurrent.futures.process import BrokenProcessPool
+from engine import Engine
+from engine import NewEngine
+from engine import SEED_BITS
+from engine import place_mines
+import os
+import random
+import solver
+
+# Worker processes, seeds each task tries, and tasks kept in flight for every worker
+WORKERS = os.cpu_count() or 1
+SEEDS_PER_TASK = 4
+TASKS_PER_WORKER = 2
+
+# Seeds tried before giving up (some boards are too dense to ever be solved without guessing) - the last board is used,
+# and the game knows it may need guessing
+MAX_SEEDS = 4000
+
+# Worker processes shared by every no guessing board (started on first use)
+pool = None
+
+
+def solvable(board_size, bomb_count, square, mines):
+  """ Returns True if the bombs can all be found by logic from a first click on square. Gives up as soon as the solver
+  finds no safe square to uncover."""
+  game = Engine()
+  game.running = True
+  game.clicked = True
+  game.board_size = board_size
+  game.bomb_count = bomb_count
+  game.flag_count = bomb_count
+  game.uncover_count = board_size[0] * board_size[1] - bomb_count
+  game.load_squares(mines, bytearray(len(mines)))
+  game.move(game.state_options[1], square)
+
+  while game.running:
+    safe = solver.solve(game)[0]
+    if not safe:
+      return False
+    game.apply_moves([(game.state_options[1], safe_square) for safe_square in safe])
+
+  return game.game_won
+
+
+def try_seeds(board_size, bomb_count, square, safe_radius, seeds):
+  """ Returns the first seed whose board can be solved without guessing, or None. Runs in the worker processes."""
+  for seed in seeds:
+    mines = place_mines(board_size, bomb_count, square, random.Random(seed), safe_radius)
+    if solvable(board_size, bomb_count, square, mines):
+      return seed
+  return None
+
+
+def worker_pool():
+  """ Returns the pool of worker processes, starting it the first time."""
+  global pool
+  if pool is None:
+    pool = ProcessPoolExecutor(WORKERS)
+  return pool
+
+
+def no_guess_seed(board_size, bomb_count, square, safe_radius, rng):
+  """ Returns the seed of a board that can be solved without guessing from a first click on square (bombs placed by
+  place_mines) and True. Candidate seeds come from rng. After MAX_SEEDS tries, the last seed is returned anyway, with False.
+  Seeds are tried on the worker pool, or in this process if the pool can't be used."""
+  global pool
+  board_size = tuple(board_size)
+  try:
+    return pool_seed(board_size, bomb_count, square, safe_radius, rng)
+  except (OSError, NotImplementedError, BrokenProcessPool):
+    pool = None
+
+  seed = None
+  for tried in range(MAX_SEEDS):
+    seed = rng.getrandbits(SEED_BITS)
+    if try_seeds(board_size, bomb_count, square, safe_radius, [seed]) is not None:
+      return seed, True
+  return seed, False
+
+
+def pool_seed(board_size, bomb_count, square, safe_radius, rng):
+  """ Tries seeds on the worker pool, several at once - the first that works is used and the rest are cancelled.
+  Returns the seed and whether it works, like no_guess_seed."""
+  executor = worker_pool()
+  in_flight = set()
+  tried = 0
+  seed = None
+
+  try:
+    while tried < MAX_SEEDS:
+      # Keeps every worker busy with candidates
+      while len(in_flight) < TASKS_PER_WORKER * WORKERS and tried < MAX_SEEDS:
+        seeds = [rng.getrandbits(SEED_BITS) for i in range(SEEDS_PER_TASK)]
+        in_flight.add(executor.submit(try_seeds, board_size, bomb_count, square, safe_radius, seeds))
+        tried += len(seeds)
+        seed = seeds[-1]
+
+      done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+      for future in done:
+        if future.result() is not None:
+          return future.result(), True
+
+    # Waits for the last candidates before giving up
+    for future in in_flight:
+      if future.result() is not None:
+        return future.result(), True
+    in_flight = set()
+    return seed, False
+
+  finally:
+    for future in in_flight:
+      future.cancel()
+
+
+class NoGuessEngine(NewEngine):
+  """ New game whose board can be solved from the first click without guessing. The board is found for the first click
+  (see search), and its seed becomes the board's seed (so its board code gives the same board as any other).
+  no_guessing is False if no such board was found in MAX_SEEDS tries (None until the bombs are placed)."""
+  __slots__ = ("search_result", "no_guessing")
+
+  def __init__(self, *args, **kwargs):
+    """ Sets up the game with no board found yet."""
+    super().__init__(*args, **kwargs)
+
+    # (first click square, seed, whether it needs no guessing) of the last search
+    self.search_result = None
+    self.no_guessing = None
+
+  @property
+  def board_code(self):
+    """ The shareable code of the board, once the first click has found it (None before)."""
+    return super().board_code if self.clicked else None
+
+  def search(self, square):
+    """ Finds a seed whose board needs no guessing from a first click on square, for the click to use. It is slow, so it can
+    run on a background thread before the click is made (nothing else may use the game until it is done)."""
+    seed, found = no_guess_seed(self.board_size, self.bomb_count, square, self.safe_radius, self.rng)
+    self.search_result = (tuple(square), seed, found)
+
+  def place_bombs(self, square):
+    """ Places the bombs of the board found for square (searching now if it wasn't searched for already)."""
+    if self.search_result is None or self.search_result[0] != tuple(square):
+      self.search(square)
+    square, self.seed, self.no_guessing = self.search_result
+    self.rng = random.Random(self.seed)
+
+    # The found seed's bombs are placed from scratch (never a board prepared from another seed)
+    self.prepared = None
+    super().place_bombs(square)
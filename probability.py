@@ -0,0 +1,322 @@
+_author_ = "Asif Rahman"
+_date_ = "Saturday, October 17, 2026"
+_version_ = "1.0"
+_filename_ = "probability.py"
+_description_ = "Minesweeper bomb probabilities. Works out the exact chance of a bomb under every covered square from what the player can see."
+
+from math import comb
+from math import lgamma
+from math import exp
+import random
+import solver
+
+# Most states a component's layouts are counted through before they are sampled instead
+MAX_STATES = 20000
+
+# Layouts sampled from a component too big to count, the tries allowed for each, and the seed (the same game always
+# gives the same probabilities)
+SAMPLE_LAYOUTS = 2000
+SAMPLE_TRIES = 200
+SAMPLE_SEED = 0
+
+
+class ComponentTooBig(Exception):
+  """ Raised when a component has too many states to count its layouts exactly."""
+
+
+class Probabilities:
+  """ Exact bomb probabilities of every covered square, given the uncovered numbers and the bomb count (flags are
+  treated as covered squares, as they may be wrong). The frontier is split into independent components whose layouts are
+  counted separately, then weighted by how many ways the rest of the bombs fit in the squares no number touches.
+  Components are kept from one call to the next, so after a move only the components it changed are counted again."""
+
+  def __init__(self):
+    """ Sets up an empty store of component results."""
+    self.components = {}
+
+  def calculate(self, engine):
+    """ Returns a dictionary of (row, column) : bomb probability for every covered square next to an uncovered number,
+    and the bomb probability shared by every other covered square (None if there are none)."""
+    columns = engine.board_size[1]
+    constraints, squares, covered_count = solver.frontier(engine.board_size, engine.square_states, engine.counts)
+    safe, mines, constraints = solver.propagate(constraints)
+
+    # Components that didn't change since the last call are reused (and only the ones still in the game are kept)
+    results = []
+    components = {}
+    frontier_mask = safe | mines
+    for component_mask, component in solver.split_components(constraints):
+      frontier_mask |= component_mask
+      key = component_key(component, squares)
+      result = self.components.get(key)
+      if result is None:
+        result = component_layouts(component_mask, component, squares)
+      components[key] = result
+      results.append(result)
+    self.components = components
+
+    remaining = engine.bomb_count - mines.bit_count()
+    interior_count = covered_count - frontier_mask.bit_count()
+    component_chances, interior = combine(results, remaining, interior_count)
+
+    # Squares the rules already solved, then every class of every component
+    probabilities = {divmod(squares[bit.bit_length() - 1], columns) : 0.0 for bit in solver.bits(safe)}
+    probabilities.update({divmod(squares[bit.bit_length() - 1], columns) : 1.0 for bit in solver.bits(mines)})
+    for (weights, classes), chances in zip(results, component_chances):
+      for class_squares, class_chances in classes:
+        probability = sum(chance * class_chances[count] for count, chance in chances.items())
+        for index in class_squares:
+          probabilities[divmod(index, columns)] = probability
+
+    return probabilities, interior
+
+
+def component_key(component, squares):
+  """ Returns a key for a component's constraints that stays the same between calls. Small boards number squares by
+  their flat index already - bigger boards' masks are turned into flat indices."""
+  if type(squares) is range:
+    return frozenset(component.items())
+  return frozenset((tuple(squares[bit.bit_length() - 1] for bit in solver.bits(mask)), count)
+                   for mask, count in component.items())
+
+
+def component_layouts(component_mask, constraints, squares):
+  """ Returns the number of layouts of each bomb count of a component, and the flat indices of the squares in each of its
+  classes with the bomb probability of those squares for each bomb count. Components too wide to count are sampled."""
+  classes, class_constraints = solver.component_classes(component_mask, constraints)
+  try:
+    weights, expected = count_layouts(classes, class_constraints, list(constraints.values()))
+  except ComponentTooBig:
+    weights, expected = sample_layouts(classes, class_constraints, list(constraints.values()))
+
+  class_results = []
+  for part, class_expected in zip(classes, expected):
+    size = part.bit_count()
+    class_squares = tuple(squares[bit.bit_length() - 1] for bit in solver.bits(part))
+    class_results.append((class_squares, {count : class_expected.get(count, 0) / (weight * size)
+                                          for count, weight in weights.items()}))
+  return weights, class_results
+
+
+def class_bounds(classes, class_constraints):
+  """ Returns the class sizes, the constraints still open at every position (with classes before and after it), and the
+  squares that each of a class's constraints has after it."""
+  sizes = [part.bit_count() for part in classes]
+  last = {}
+  for position, numbers in enumerate(class_constraints):
+    for number in numbers:
+      last[number] = position
+
+  # Constraints are opened by their first class and closed by their last (a dictionary keeps them in order)
+  open_constraints = [()]
+  opened = {}
+  for position, numbers in enumerate(class_constraints):
+    for number in numbers:
+      opened[number] = None
+      if last[number] == position:
+        del opened[number]
+    open_constraints.append(tuple(opened))
+
+  # Squares left in each of a class's constraints after it
+  later = [None] * len(classes)
+  left = {}
+  for position in range(len(classes) - 1, -1, -1):
+    later[position] = [left.get(number, 0) for number in class_constraints[position]]
+    for number in class_constraints[position]:
+      left[number] = left.get(number, 0) + sizes[position]
+
+  return sizes, open_constraints, later
+
+
+def count_layouts(classes, class_constraints, needs):
+  """ Counts a component's layouts through its classes in order. The layouts of the classes left only depend on the
+  bombs the open constraints still need (the state), so layouts with the same state are counted together - forwards to
+  every state, then backwards from the end. Returns the weight (number of layouts) of each bomb count and, for each
+  class, the total of weight * bombs in the class for each bomb count. Raises ComponentTooBig if there are too many states."""
+  sizes, open_constraints, later = class_bounds(classes, class_constraints)
+  end = len(classes)
+
+  # Forwards - bomb count : weight of every state reached before each class, and every move between states
+  forward = [{} for position in range(end + 1)]
+  forward[0][()] = {0 : 1}
+  moves = []
+  for position in range(end):
+    numbers = class_constraints[position]
+    size = sizes[position]
+    opened = open_constraints[position]
+    after = open_constraints[position + 1]
+    position_moves = []
+
+    for state, counts in forward[position].items():
+      needed = dict(zip(opened, state))
+      for number in numbers:
+        needed.setdefault(number, needs[number])
+
+      # Each constraint needs between 0 and its squares left after this class's worth of bombs from this class
+      low = max([needed[number] - squares_left for number, squares_left in zip(numbers, later[position])] + [0])
+      high = min([needed[number] for number in numbers] + [size])
+      for bombs in range(low, high + 1):
+        next_state = tuple(needed[number] - bombs if number in numbers else needed[number] for number in after)
+        weight = comb(size, bombs)
+        position_moves.append((state, bombs, next_state, weight))
+
+        next_counts = forward[position + 1].setdefault(next_state, {})
+        for count, count_weight in counts.items():
+          next_counts[count + bombs] = next_counts.get(count + bombs, 0) + count_weight * weight
+
+    if len(forward[position + 1]) > MAX_STATES:
+      raise ComponentTooBig
+    moves.append(position_moves)
+
+  # Backwards - bomb count : weight of finishing from every state, and the expected bombs of each class
+  backward = {() : {0 : 1}}
+  expected = [None] * end
+  for position in range(end - 1, -1, -1):
+    previous = {}
+    class_expected = {}
+    for state, bombs, next_state, weight in moves[position]:
+      finishes = backward.get(next_state)
+      if finishes is None:
+        continue
+
+      state_finishes = previous.setdefault(state, {})
+      for count, finish_weight in finishes.items():
+        state_finishes[count + bombs] = state_finishes.get(count + bombs, 0) + weight * finish_weight
+
+      # Layouts through this move, by their total bomb count
+      if bombs:
+        for start_count, start_weight in forward[position][state].items():
+          for count, finish_weight in finishes.items():
+            total = start_count + bombs + count
+            class_expected[total] = class_expected.get(total, 0) + start_weight * weight * finish_weight * bombs
+
+    expected[position] = class_expected
+    backward = previous
+
+  return backward.get((), {}), expected
+
+
+def sample_layouts(classes, class_constraints, needs):
+  """ Estimates count_layouts for a component too wide to count, from up to SAMPLE_LAYOUTS different layouts found by a
+  randomised search (each weighted by its number of layouts, as if they were the only ones)."""
+  sizes, open_constraints, later = class_bounds(classes, class_constraints)
+  rng = random.Random(SAMPLE_SEED)
+  end = len(classes)
+  found = set()
+
+  for sample in range(SAMPLE_LAYOUTS):
+    # Depth-first search with the bomb counts of each class tried in a random order, up to SAMPLE_TRIES dead ends
+    # (the game has a layout, so the first search goes on until it finds one)
+    needed = list(needs)
+    layout = []
+    options = []
+    tries = 0
+    position = 0
+    while position < end and (tries < SAMPLE_TRIES or not found):
+      if len(options) == position:
+        numbers = class_constraints[position]
+        low = max([needed[number] - squares_left for number, squares_left in zip(numbers, later[position])] + [0])
+        high = min([needed[number] for number in numbers] + [sizes[position]])
+        choices = list(range(low, high + 1))
+        rng.shuffle(choices)
+        options.append(choices)
+
+      # Dead end - back to the previous class
+      if not options[position]:
+        options.pop()
+        tries += 1
+        position -= 1
+        if position < 0:
+          break
+        bombs = layout.pop()
+        for number in class_constraints[position]:
+          needed[number] += bombs
+        continue
+
+      bombs = options[position].pop()
+      for number in class_constraints[position]:
+        needed[number] -= bombs
+      layout.append(bombs)
+      position += 1
+
+    if position == end:
+      found.add(tuple(layout))
+
+  weights = {}
+  expected = [{} for position in range(end)]
+  for layout in found:
+    weight = 1
+    for size, bombs in zip(sizes, layout):
+      weight *= comb(size, bombs)
+    count = sum(layout)
+    weights[count] = weights.get(count, 0) + weight
+    for position, bombs in enumerate(layout):
+      if bombs:
+        expected[position][count] = expected[position].get(count, 0) + weight * bombs
+
+  return weights, expected
+
+
+def log_comb(n, k):
+  """ Returns the natural log of n choose k."""
+  return lgamma(n + 1) - lgamma(k + 1) - lgamma(n - k + 1)
+
+
+def convolve(first, second):
+  """ Returns the weights of every total bomb count of two independent sets of layouts (bomb count : weight each)."""
+  result = {}
+  for first_count, first_weight in first.items():
+    for second_count, second_weight in second.items():
+      result[first_count + second_count] = result.get(first_count + second_count, 0) + first_weight * second_weight
+  return result
+
+
+def combine(results, remaining, interior_count):
+  """ Weights the components' bomb counts by how many ways the remaining bombs fit in the rest of the board.
+  Returns the chance of each bomb count of every component, and the bomb probability of the squares no number touches."""
+  # Component weights relative to their biggest (layout counts grow too big for floats), as floats
+  relative = []
+  for weights, classes in results:
+    largest = max(weights.values(), default=1)
+    relative.append({count : weight / largest for count, weight in weights.items()})
+
+  # Ways the interior can have the rest of the bombs, relative to the most likely bomb count
+  def interior_weights(counts):
+    """ Returns bombs left for the interior : relative weight, for the frontier totals in counts."""
+    possible = [remaining - count for count in counts if 0 <= remaining - count <= interior_count]
+    if not possible:
+      return {}
+    logs = {bombs : log_comb(interior_count, bombs) for bombs in possible}
+    largest = max(logs.values())
+    return {bombs : exp(log - largest) for bombs, log in logs.items()}
+
+  # Totals of every component but one (prefix and suffix convolutions), so each component is weighted by the others
+  prefix = [{0 : 1.0}]
+  for weights in relative:
+    prefix.append(convolve(prefix[-1], weights))
+  suffix = [{0 : 1.0}]
+  for weights in reversed(relative):
+    suffix.append(convolve(suffix[-1], weights))
+  suffix.reverse()
+
+  totals = prefix[-1]
+  interior = interior_weights(totals)
+  normaliser = sum(weight * interior.get(remaining - total, 0) for total, weight in totals.items())
+  if normaliser == 0:
+    raise ValueError("No bomb layout fits the uncovered numbers and bomb count")
+
+  chances = []
+  for position, weights in enumerate(relative):
+    others = convolve(prefix[position], suffix[position + 1])
+    component_chances = {}
+    for count, weight in weights.items():
+      ways = sum(other_weight * interior.get(remaining - count - other, 0) for other, other_weight in others.items())
+      component_chances[count] = weight * ways / normaliser
+    chances.append(component_chances)
+
+  interior_probability = None
+  if interior_count:
+    interior_probability = sum(weight * interior.get(remaining - total, 0) * (remaining - total) / interior_count
+                               for total, weight in totals.items()) / normaliser
+
+  return chances, interior_probability
@@ -0,0 +1,332 @@
+_author_ = "Asif Rahman"
+_date_ = "Saturday, October 17, 2026"
+_version_ = "1.0"
+_filename_ = "renderers.py"
+_description_ = "Minesweeper board renderers. LabelRenderer draws a label per square, CanvasRenderer draws tiles on one canvas, ViewportRenderer only draws the visible part of a scrollable canvas."
+
+import tkinter as tk
+
+
+class LabelRenderer:
+  """ Draws a board with one tk.Label per square. The labels are created once and updated in place."""
+  # Square label border width and text font
+  SQUARE_BORDER = 2
+  TEXT_FONT = ("Roboto", 8, "bold")
+
+  def __init__(self, board):
+    """ Creates one label per square in the board's frame."""
+    self.board = board
+    self.squares = []
+
+    # For each row
+    for i in range(board.board_size[0]):
+      row = []
+
+      # For each column
+      for j in range(board.board_size[1]):
+        label = tk.Label(board.frame, bd=self.SQUARE_BORDER)
+
+        # Left-click - uncover square, Right-click - flag or unflag square (move ignores illegal moves)
+        # Middle-click or Shift + left-click - chord a number
+        label.bind("<Button-1>", lambda event, square=(i, j): board.click(board.state_options[1], square))
+        label.bind("<Button-3>", lambda event, square=(i, j): board.click(board.state_options[2], square))
+        label.bind("<Button-2>", lambda event, square=(i, j): board.click(board.CHORD, square))
+        label.bind("<Shift-Button-1>", lambda event, square=(i, j): board.click(board.CHORD, square))
+
+        label.grid(row=i, column=j)
+        row.append(label)
+      self.squares.append(row)
+
+  def output_square(self, row, column):
+    """ Outputs the given square by updating its label."""
+    board = self.board
+    label = self.squares[row][column]
+    state = board.square_state(row, column)
+
+    # If it is covered, output a blank sqaure
+    if state == board.COVERED:
+      label.config(text="",
+                   relief=tk.RAISED,
+                   cursor="dotbox",
+                   font="TkDefaultFont",
+                   bg=board.colours["square"])
+
+    # If it's uncovered, output the number.
+    elif state == board.UNCOVERED:
+
+      # Makes zeros blank
+      uncovered_text = board.square_value(row, column)
+      if uncovered_text == 0:
+        uncovered_text = ""
+
+      label.config(text=uncovered_text,
+                   relief=tk.SUNKEN,
+                   cursor="",
+                   font=self.TEXT_FONT,
+                   bg=board.colours["background"],
+                   fg=board.colours["text"])
+
+    # If it's' flagged, output a flag
+    elif state == board.FLAGGED:
+      label.config(text=board.FLAG_SYMBOL,
+                   relief=tk.RAISED,
+                   cursor="",
+                   font=self.TEXT_FONT,
+                   bg=board.colours["square"],
+                   fg=board.colours["flag"])
+
+    # If the square is incorrectly flagged (revealed on death)
+    else:
+      label.config(text=board.INCORRECT_FLAG_SYMBOL,
+                   relief=tk.RAISED,
+                   cursor="",
+                   font=self.TEXT_FONT,
+                   bg=board.colours["square"],
+                   fg=board.colours["flag"])
+
+    # Applies the current square size
+    label.config(height=board.square_dimensions[0], width=board.square_dimensions[1])
+
+  def output_board(self):
+    """ Outputs every square."""
+    for i in range(self.board.board_size[0]):
+      for j in range(self.board.board_size[1]):
+        self.output_square(i, j)
+
+  def destroy(self):
+    """ Removes the labels from the frame."""
+    for row in self.squares:
+      for label in row:
+        label.destroy()
+
+
+class TileAtlas:
+  """ Pre-rendered square images, one per state and number, for the board's current colours and size."""
+  # Pixels per unit of square_dimensions (height, width) - close to the size of a label square
+  UNIT_SIZE = (16, 9)
+  BEVEL = 2
+
+  # 5x7 pixel glyphs drawn on the tiles
+  GLYPHS = {
+    1 : ["..#..", ".##..", "..#..", "..#..", "..#..", "..#..", ".###."],
+    2 : [".###.", "#...#", "....#", "...#.", "..#..", ".#...", "#####"],
+    3 : ["####.", "....#", "....#", ".###.", "....#", "....#", "####."],
+    4 : ["...#.", "..##.", ".#.#.", "#..#.", "#####", "...#.", "...#."],
+    5 : ["#####", "#....", "####.", "....#", "....#", "#...#", ".###."],
+    6 : [".###.", "#....", "#....", "####.", "#...#", "#...#", ".###."],
+    7 : ["#####", "....#", "...#.", "..#..", ".#...", ".#...", ".#..."],
+    8 : [".###.", "#...#", "#...#", ".###.", "#...#", "#...#", ".###."],
+    "bomb" : [".....", ".###.", "#####", "#####", "#####", ".###.", "....."],
+    "flag" : [".##..", ".###.", ".####", ".##..", ".#...", ".#...", "###.."],
+    "incorrect_flag" : ["#...#", "#...#", ".#.#.", "..#..", ".#.#.", "#...#", "#...#"],
+  }
+
+  def __init__(self, board):
+    """ Renders every tile for the board."""
+    self.height = board.square_dimensions[0] * self.UNIT_SIZE[0]
+    self.width = board.square_dimensions[1] * self.UNIT_SIZE[1]
+    colours = board.colours
+
+    # Tile for every covered state code
+    self.covered_tiles = {
+      board.COVERED : self.render(colours["square"], True),
+      board.FLAGGED : self.render(colours["square"], True, "flag", colours["flag"]),
+      board.INCORRECT_FLAGGED : self.render(colours["square"], True, "incorrect_flag", colours["flag"]),
+    }
+
+    # Tile for every uncovered square value (number or bomb identifier)
+    self.uncovered_tiles = {
+      board.BOMB_IDENTIFIER : self.render(colours["background"], False, "bomb", colours["text"]),
+      0 : self.render(colours["background"], False),
+    }
+    for number in range(1, 9):
+      self.uncovered_tiles[number] = self.render(colours["background"], False, number, colours["text"])
+
+  def tile(self, board, row, column):
+    """ Returns the tile for a square of the board."""
+    state = board.square_state(row, column)
+    if state == board.UNCOVERED:
+      return self.uncovered_tiles[board.square_value(row, column)]
+    return self.covered_tiles[state]
+
+  def render(self, face_colour, raised, glyph=None, glyph_colour=None):
+    """ Returns a bevelled tile image, with a glyph in the middle if given."""
+    image = tk.PhotoImage(width=self.width, height=self.height)
+    light = self.shade(face_colour, 1.3)
+    dark = self.shade(face_colour, 0.6)
+
+    # Raised squares are lit from the top left, sunken squares from the bottom right
+    if not raised:
+      light, dark = dark, light
+
+    # Face, then top/left and bottom/right bevels
+    image.put(face_colour, to=(0, 0, self.width, self.height))
+    image.put(light, to=(0, 0, self.width, self.BEVEL))
+    image.put(light, to=(0, 0, self.BEVEL, self.height))
+    image.put(dark, to=(0, self.height - self.BEVEL, self.width, self.height))
+    image.put(dark, to=(self.width - self.BEVEL, 0, self.width, self.height))
+
+    if glyph is not None:
+      rows = self.GLYPHS[glyph]
+
+      # Largest whole-pixel scale that fits inside the bevel
+      scale = max(1, min((self.width - 4 * self.BEVEL) // len(rows[0]), (self.height - 4 * self.BEVEL) // len(rows)))
+      left = (self.width - scale * len(rows[0])) // 2
+      top = (self.height - scale * len(rows)) // 2
+
+      for y, glyph_row in enumerate(rows):
+        for x, pixel in enumerate(glyph_row):
+          if pixel == "#":
+            image.put(glyph_colour, to=(left + x * scale, top + y * scale, left + (x + 1) * scale, top + (y + 1) * scale))
+
+    return image
+
+  def shade(self, colour, factor):
+    """ Returns a lighter (factor > 1) or darker (factor < 1) version of a #rrggbb colour."""
+    channels = [int(colour[i:i + 2], 16) for i in (1, 3, 5)]
+    return "#" + "".join(f"{min(255, round(channel * factor)):02x}" for channel in channels)
+
+
+class CanvasRenderer:
+  """ Draws a board as tiles on one tk.Canvas, with one binding per mouse button for every square."""
+
+  def __init__(self, board):
+    """ Creates the canvas in the board's frame."""
+    self.board = board
+    self.atlas = None
+    self.items = []
+
+    self.canvas = tk.Canvas(board.frame, bd=0, highlightthickness=0, cursor="dotbox")
+    self.canvas.bind("<Button-1>", lambda event: self.click(event, board.state_options[1]))
+    self.canvas.bind("<Button-3>", lambda event: self.click(event, board.state_options[2]))
+    self.canvas.bind("<Button-2>", lambda event: self.click(event, board.CHORD))
+    self.canvas.bind("<Shift-Button-1>", lambda event: self.click(event, board.CHORD))
+    self.canvas.grid(row=0, column=0)
+
+  def click(self, event, new_state):
+    """ Maps a click's pixel coordinates (on the whole canvas, scrolled or not) to a square and moves there."""
+    row = int(self.canvas.canvasy(event.y)) // self.atlas.height
+    column = int(self.canvas.canvasx(event.x)) // self.atlas.width
+
+    if 0 <= row < self.board.board_size[0] and 0 <= column < self.board.board_size[1]:
+      self.board.click(new_state, (row, column))
+
+  def output_square(self, row, column):
+    """ Outputs the given square by switching its tile."""
+    item = self.items[row * self.board.board_size[1] + column]
+    self.canvas.itemconfig(item, image=self.atlas.tile(self.board, row, column))
+
+  def output_board(self):
+    """ Re-renders the tiles (colours or size may have changed) and outputs every square."""
+    old_atlas = self.atlas
+    self.atlas = TileAtlas(self.board)
+    rows, columns = self.board.board_size
+
+    # Lays out one image item per square when the canvas is new or the square size changed
+    if old_atlas is None or (old_atlas.height, old_atlas.width) != (self.atlas.height, self.atlas.width):
+      self.canvas.delete("all")
+      self.canvas.config(width=columns * self.atlas.width, height=rows * self.atlas.height)
+      self.items = [self.canvas.create_image(j * self.atlas.width, i * self.atlas.height, anchor=tk.NW)
+                    for i in range(rows) for j in range(columns)]
+
+    for i in range(rows):
+      for j in range(columns):
+        self.output_square(i, j)
+
+  def destroy(self):
+    """ Removes the canvas from the frame."""
+    self.canvas.destroy()
+
+
+class ViewportRenderer(CanvasRenderer):
+  """ Draws a scrollable canvas that only has tiles for the squares in view (plus a margin), for boards of any size."""
+  # Most squares shown at once (rows, columns) and extra squares drawn around the view
+  VIEWPORT = (20, 40)
+  MARGIN = 2
+
+  def __init__(self, board):
+    """ Creates the canvas with scrollbars in the board's frame."""
+    super().__init__(board)
+    self.items = {}
+
+    # Scrollbars - every scroll redraws the viewport
+    self.y_scroll = tk.Scrollbar(board.frame, orient=tk.VERTICAL, command=self.yview)
+    self.y_scroll.grid(row=0, column=1, sticky=tk.NS)
+    self.x_scroll = tk.Scrollbar(board.frame, orient=tk.HORIZONTAL, command=self.xview)
+    self.x_scroll.grid(row=1, column=0, sticky=tk.EW)
+    self.canvas.config(xscrollcommand=self.x_scroll.set, yscrollcommand=self.y_scroll.set)
+
+    # Mouse wheel scrolls rows, Shift + mouse wheel scrolls columns (Button-4/5 on Linux)
+    self.canvas.bind("<MouseWheel>", lambda event: self.yview("scroll", -1 if event.delta > 0 else 1, "units"))
+    self.canvas.bind("<Shift-MouseWheel>", lambda event: self.xview("scroll", -1 if event.delta > 0 else 1, "units"))
+    self.canvas.bind("<Button-4>", lambda event: self.yview("scroll", -1, "units"))
+    self.canvas.bind("<Button-5>", lambda event: self.yview("scroll", 1, "units"))
+    self.canvas.bind("<Shift-Button-4>", lambda event: self.xview("scroll", -1, "units"))
+    self.canvas.bind("<Shift-Button-5>", lambda event: self.xview("scroll", 1, "units"))
+
+  def xview(self, *args):
+    """ Scrolls the canvas horizontally and redraws the viewport."""
+    self.canvas.xview(*args)
+    self.update_viewport()
+
+  def yview(self, *args):
+    """ Scrolls the canvas vertically and redraws the viewport."""
+    self.canvas.yview(*args)
+    self.update_viewport()
+
+  def visible_squares(self):
+    """ Returns the row and column ranges in view, including the margin."""
+    rows, columns = self.board.board_size
+    top = int(self.canvas.canvasy(0)) // self.atlas.height - self.MARGIN
+    left = int(self.canvas.canvasx(0)) // self.atlas.width - self.MARGIN
+
+    row_range = range(max(0, top), min(rows, top + self.VIEWPORT[0] + 2 * self.MARGIN + 1))
+    column_range = range(max(0, left), min(columns, left + self.VIEWPORT[1] + 2 * self.MARGIN + 1))
+    return row_range, column_range
+
+  def update_viewport(self):
+    """ Removes tiles that scrolled out of view and creates tiles for squares that scrolled in."""
+    row_range, column_range = self.visible_squares()
+
+    # Removes squares outside the viewport
+    for square in [square for square in self.items if square[0] not in row_range or square[1] not in column_range]:
+      self.canvas.delete(self.items.pop(square))
+
+    # Creates squares inside the viewport that don't have a tile yet
+    for i in row_range:
+      for j in column_range:
+        if (i, j) not in self.items:
+          self.items[(i, j)] = self.canvas.create_image(j * self.atlas.width, i * self.atlas.height, anchor=tk.NW,
+                                                        image=self.atlas.tile(self.board, i, j))
+
+  def output_square(self, row, column):
+    """ Outputs the given square if it is in the viewport."""
+    if (row, column) in self.items:
+      self.canvas.itemconfig(self.items[(row, column)], image=self.atlas.tile(self.board, row, column))
+
+  def output_board(self):
+    """ Re-renders the tiles (colours or size may have changed) and outputs the viewport."""
+    old_atlas = self.atlas
+    self.atlas = TileAtlas(self.board)
+    rows, columns = self.board.board_size
+
+    # Sizes the view and scroll region when the canvas is new or the square size changed
+    if old_atlas is None or (old_atlas.height, old_atlas.width) != (self.atlas.height, self.atlas.width):
+      self.canvas.delete("all")
+      self.items = {}
+      self.canvas.config(width=min(columns, self.VIEWPORT[1]) * self.atlas.width,
+                         height=min(rows, self.VIEWPORT[0]) * self.atlas.height,
+                         scrollregion=(0, 0, columns * self.atlas.width, rows * self.atlas.height),
+                         xscrollincrement=self.atlas.width,
+                         yscrollincrement=self.atlas.height)
+
+    # Outputs the squares already in view, then fills in the rest of the viewport
+    for row, column in self.items:
+      self.output_square(row, column)
+    self.update_viewport()
+
+  def destroy(self):
+    """ Removes the canvas and scrollbars from the frame."""
+    super().destroy()
+    self.x_scroll.destroy()
+    self.y_scroll.destroy()
@@ -0,0 +1,184 @@
+_author_ = "Asif Rahman"
+_date_ = "Saturday, October 17, 2026"
+_version_ = "1.0"
+_filename_ = "replay.py"
+_description_ = "Minesweeper replays. Records every move of a game with its time, saves replay files and plays them back with instant seeking."
+
+from engine import Engine
+from journal import RECORD
+import math
+import re
+import save_format
+import struct
+import time
+
+# File identifier, version and extension
+MAGIC = b"MSWR"
+VERSION = 1
+EXTENSION = ".msr"
+
+# Header - magic, version, seed (-1 if the board had none) and the size of the starting position's binary save that follows it
+HEADER = struct.Struct("<4sBqQ")
+
+# Moves between checkpoints, raised so checkpoints of big boards never take more than CHECKPOINT_MEMORY bytes in total
+CHECKPOINT_EVERY = 32
+CHECKPOINT_MEMORY = 64 * 1024 * 1024
+
+# Any square state byte that isn't 0 (changed squares in the XOR of two boards)
+CHANGED_PATTERN = re.compile(rb"[^\x00]")
+
+
+class Recording:
+  """ Records every move made on an engine with its time, from the moment recording starts."""
+
+  def __init__(self, engine):
+    """ Starts recording the engine's moves. Games already begun are recorded from their current position."""
+    self.engine = engine
+    self.moves = []
+    self.start = save_format.binary_save_data(engine) if engine.clicked else None
+    engine.subscribe(self.handle_event)
+
+  def handle_event(self, event, *args):
+    """ Records moves made on the engine."""
+    if event == self.engine.MOVE_MADE:
+      new_state, square = args
+      self.moves.append((self.engine.state_options.index(new_state), square[0], square[1], time.time()))
+
+  def start_data(self):
+    """ Returns the starting position in the binary save format - for a new game, its bombs with every square covered."""
+    if self.start is not None:
+      return self.start
+
+    engine = self.engine
+    start = Engine()
+    for variable in engine.save_variables:
+      setattr(start, variable, getattr(engine, variable))
+
+    # Bombs are placed on the first click, so the start has them already (the same click then doesn't place them again)
+    start.running = True
+    start.clicked = True
+    start.game_won = None
+    start.flag_count = engine.bomb_count
+    start.uncover_count = len(engine.mines) - engine.bomb_count
+    start.end_time = None
+    start.mines = engine.mines
+    start.square_states = bytearray(len(engine.mines))
+    return save_format.binary_save_data(start)
+
+  def save(self, path):
+    """ Writes the recorded game to a replay file. Raises ValueError if the game hasn't begun (it has no bombs yet)."""
+    if not self.engine.clicked:
+      raise ValueError("Game has not begun")
+
+    start = self.start_data()
+    seed = -1 if self.engine.seed is None else self.engine.seed
+    with open(path, "wb") as replay_file:
+      replay_file.write(HEADER.pack(MAGIC, VERSION, seed, len(start)))
+      replay_file.write(start)
+      replay_file.write(b"".join(RECORD.pack(*move) for move in self.moves))
+
+
+def load_replay(path):
+  """ Returns the starting position, moves and seed of a replay file (to make a ReplayEngine with).
+  Raises ValueError if the file is not a valid replay file."""
+  with open(path, "rb") as replay_file:
+    data = replay_file.read()
+
+  if len(data) < HEADER.size:
+    raise ValueError("Replay file header is incomplete")
+  magic, version, seed, start_size = HEADER.unpack_from(data)
+
+  if magic != MAGIC:
+    raise ValueError("Not a Minesweeper replay file")
+  if version != VERSION:
+    raise ValueError(f"Unsupported replay file version {version}")
+  if (len(data) - HEADER.size - start_size) % RECORD.size or len(data) < HEADER.size + start_size:
+    raise ValueError("Replay file size does not match its moves")
+
+  start = data[HEADER.size : HEADER.size + start_size]
+  moves = list(RECORD.iter_unpack(data[HEADER.size + start_size :]))
+  return start, moves, None if seed == -1 else seed
+
+
+class ReplayEngine(Engine):
+  """ Plays a recorded game back. seek jumps to any move without sending events for the moves in between -
+  it starts from the nearest checkpoint (saved every checkpoint_every moves as they are first played) and sends
+  one SQUARES_CHANGED event with every square that differs."""
+  __slots__ = ("moves", "move_index", "checkpoints", "checkpoint_every")
+
+  def __init__(self, start, moves, seed=None):
+    """ Loads the starting position (in the binary save format) and checks the moves fit the board.
+    Raises ValueError if either is not valid."""
+    super().__init__()
+    save_format.load_binary_data(self, start)
+    self.seed = seed
+
+    # Bombs are placed by the first click, which a replay can't do
+    if not self.clicked:
+      raise ValueError("Replay starts before the first click")
+
+    rows, columns = self.board_size
+    for state, row, column, move_time in moves:
+      if state not in (1, 2) or row >= rows or column >= columns:
+        raise ValueError("Invalid move in replay")
+
+    self.moves = moves
+    self.move_index = 0
+    self.checkpoint_every = max(CHECKPOINT_EVERY, math.ceil(len(moves) * len(self.square_states) / CHECKPOINT_MEMORY))
+    self.checkpoints = [self.checkpoint()]
+
+  def apply_moves(self, moves):
+    """ Replays are watched, not played - moves from the view are ignored."""
+    return set()
+
+  def checkpoint(self):
+    """ Returns the current position (the bombs never change during a replay)."""
+    return (bytes(self.square_states), self.running, self.game_won, self.flag_count, self.uncover_count, self.end_time)
+
+  def restore(self, checkpoint):
+    """ Goes back to a position returned by checkpoint."""
+    square_states, self.running, self.game_won, self.flag_count, self.uncover_count, self.end_time = checkpoint
+    self.square_states = bytearray(square_states)
+
+  def move_delay(self, index):
+    """ Returns the seconds the player took before the move at index."""
+    previous_time = self.moves[index - 1][3] if index > 0 else self.start_time
+    return max(0.0, self.moves[index][3] - previous_time)
+
+  def seek(self, index):
+    """ Jumps to the position after index moves (clamped to the moves in the replay)."""
+    index = max(0, min(index, len(self.moves)))
+    if index == self.move_index:
+      return
+    before = bytes(self.square_states)
+
+    # Goes back to the nearest checkpoint if the position is behind, or a checkpoint is closer than the current position
+    nearest = min(index // self.checkpoint_every, len(self.checkpoints) - 1)
+    if index < self.move_index or nearest * self.checkpoint_every > self.move_index:
+      self.restore(self.checkpoints[nearest])
+      self.move_index = nearest * self.checkpoint_every
+
+    # Plays the moves in between without sending events (the changed squares are found by comparing the boards instead)
+    subscribers, self.subscribers = self.subscribers, []
+    unused = set()
+    try:
+      while self.move_index < index:
+        state, row, column, move_time = self.moves[self.move_index]
+        running = self.running
+        self.make_move(self.state_options[state], (row, column), unused)
+
+        # The game ended when the player made the move, not when it was replayed
+        if running and not self.running:
+          self.end_time = move_time
+
+        self.move_index += 1
+        if self.move_index == len(self.checkpoints) * self.checkpoint_every:
+          self.checkpoints.append(self.checkpoint())
+    finally:
+      self.subscribers = subscribers
+
+    # Every square that changed, in one event
+    columns = self.board_size[1]
+    difference = int.from_bytes(before, "big") ^ int.from_bytes(self.square_states, "big")
+    changed = CHANGED_PATTERN.finditer(difference.to_bytes(len(before), "big"))
+    self.notify(self.SQUARES_CHANGED, [divmod(match.start(), columns) for match in changed])
@@ -0,0 +1,282 @@
+_author_ = "Asif Rahman"
+_date_ = "Saturday, October 17, 2026"
+_version_ = "1.0"
+_filename_ = "save_format.py"
+_description_ = "Minesweeper save files. Binary saves are a header followed by bit-packed mine, revealed and flag planes, JSON saves are verified in one pass."
+
+from engine import bomb_counts
+import math
+import mmap
+import struct
+
+# File identifier, format version and extension
+MAGIC = b"MSWP"
+VERSION = 1
+EXTENSION = ".msb"
+
+# Header - magic, version, running/clicked bits, game_won, rows, columns, bomb_count, flag_count,
+# uncover_count, start_time, end_time (NaN for None) and the length of the difficulty name that follows it
+HEADER = struct.Struct("<4sBBBIIIiiddB")
+
+# Game won codes (None, True, False)
+GAME_WON_CODES = {None : 0, True : 1, False : 2}
+
+# Translations between 0/1 bytes and bit characters (so packing runs in C, not per square)
+TO_BITS = bytes.maketrans(b"\x00\x01", b"01")
+FROM_BITS = bytes.maketrans(b"01", b"\x00\x01")
+
+# Square state codes to revealed and flag bits - incorrect flags (revealed on death) set both
+REVEALED_BITS = bytes.maketrans(b"\x00\x01\x02\x03", b"\x00\x01\x00\x01")
+FLAG_BITS = bytes.maketrans(b"\x00\x01\x02\x03", b"\x00\x00\x01\x01")
+
+# Square state codes to a bit for uncovered squares only
+UNCOVERED_BITS = bytes.maketrans(b"\x00\x01\x02\x03", b"\x00\x01\x00\x00")
+
+# JSON board values are read as codes 0-8 for numbers and BOMB_CODE for the bomb identifier
+BOMB_CODE = 9
+MINE_BYTES = bytes(1 if value == BOMB_CODE else 0 for value in range(256))
+NUMBER_BYTES = bytes(0 if value == BOMB_CODE else value for value in range(256))
+NOT_MINE_MASK = bytes.maketrans(b"\x00\x01", b"\xff\x00")
+
+# Fields of a JSON save file and their exact types (bools are not accepted as ints)
+JSON_FIELD_TYPES = {
+  "running" : bool,
+  "clicked" : bool,
+  "game_won" : type(None),
+  "game_difficulty" : str,
+  "board_size" : list,
+  "bomb_count" : int,
+  "flag_count" : int,
+  "uncover_count" : int,
+  "states" : dict,
+  "board" : list,
+  "start_time" : float,
+  "end_time" : type(None),
+}
+
+
+def pack_bits(plane):
+  """ Returns a bytearray of 0s and 1s packed 8 squares per byte (first square in the highest bit)."""
+  if not plane:
+    return b""
+  return int(bytes(plane).translate(TO_BITS), 2).to_bytes((len(plane) + 7) // 8, "big")
+
+
+def unpack_bits(data, square_count):
+  """ Returns packed bits as a bytearray of 0s and 1s, one per square.
+  Raises ValueError if any of the padding bits before the first square is set."""
+  bits = int.from_bytes(data, "big")
+  if bits >> square_count:
+    raise ValueError("Invalid plane (padding bits are set)")
+  return bytearray(f"{bits:0{square_count}b}".encode().translate(FROM_BITS))
+
+
+def binary_save_data(engine):
+  """ Returns the engine's game in the binary save format."""
+  rows, columns = engine.board_size
+  difficulty = engine.game_difficulty.encode()
+  end_time = math.nan if engine.end_time is None else engine.end_time
+
+  header = HEADER.pack(MAGIC, VERSION, engine.running | engine.clicked << 1, GAME_WON_CODES[engine.game_won],
+                       rows, columns, engine.bomb_count, engine.flag_count, engine.uncover_count,
+                       engine.start_time, end_time, len(difficulty))
+
+  return b"".join((header, difficulty, pack_bits(engine.mines), pack_bits(engine.square_states.translate(REVEALED_BITS)),
+                   pack_bits(engine.square_states.translate(FLAG_BITS))))
+
+
+def save_binary(engine, path):
+  """ Writes the engine's game to a binary save file."""
+  with open(path, "wb") as save_file:
+    save_file.write(binary_save_data(engine))
+
+
+def load_binary(engine, path):
+  """ Loads a binary save file into the engine. The file is memory mapped and its planes are unpacked in C.
+  Raises ValueError if the file is not a valid save file."""
+  with open(path, "rb") as save_file:
+    try:
+      data = mmap.mmap(save_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError: # Empty file
+      raise ValueError("Save file is empty")
+
+  with data, memoryview(data) as view:
+    load_binary_data(engine, view)
+
+
+def load_binary_data(engine, data):
+  """ Loads a game in the binary save format (any bytes-like object of exactly its size) into the engine.
+  Raises ValueError if the data is not a valid save."""
+  # Header
+  if len(data) < HEADER.size:
+    raise ValueError("Save file header is incomplete")
+  (magic, version, bits, game_won, rows, columns, bomb_count, flag_count, uncover_count,
+   start_time, end_time, name_length) = HEADER.unpack_from(data)
+
+  if magic != MAGIC:
+    raise ValueError("Not a Minesweeper save file")
+  if version != VERSION:
+    raise ValueError(f"Unsupported save file version {version}")
+  if game_won not in GAME_WON_CODES.values():
+    raise ValueError("Invalid game_won")
+  if rows < 1 or columns < 1:
+    raise ValueError("Invalid board_size")
+
+  # Difficulty name, then three planes of the same size
+  square_count = rows * columns
+  plane_size = (square_count + 7) // 8
+  start = HEADER.size + name_length
+  if len(data) != start + 3 * plane_size:
+    raise ValueError("Save file size does not match board_size")
+
+  try:
+    difficulty = bytes(data[HEADER.size : start]).decode()
+  except UnicodeDecodeError:
+    raise ValueError("Invalid game_difficulty")
+  if difficulty not in engine.difficulties:
+    raise ValueError("Invalid game_difficulty")
+
+  mines = unpack_bits(data[start : start + plane_size], square_count)
+  revealed = int.from_bytes(unpack_bits(data[start + plane_size : start + 2 * plane_size], square_count), "big")
+  flags = int.from_bytes(unpack_bits(data[start + 2 * plane_size :], square_count), "big")
+
+  # Revealed and flag bits back to state codes (each byte is revealed + 2 * flag)
+  square_states = bytearray((revealed + 2 * flags).to_bytes(square_count, "big"))
+
+  # Counts and flags match the planes, and only finished games have a result
+  running = bool(bits & 1)
+  verify_squares(engine, mines, square_states, bomb_count, flag_count, uncover_count, running,
+                 game_won == GAME_WON_CODES[False])
+  if running == (game_won != GAME_WON_CODES[None]):
+    raise ValueError("Invalid game_won")
+
+  # Loads the game into the engine
+  engine.running = running
+  engine.clicked = bool(bits & 2)
+  engine.game_won = {code : won for won, code in GAME_WON_CODES.items()}[game_won]
+  engine.game_difficulty = difficulty
+  engine.board_size = (rows, columns)
+  engine.bomb_count = bomb_count
+  engine.flag_count = flag_count
+  engine.uncover_count = uncover_count
+  engine.start_time = start_time
+  engine.end_time = None if math.isnan(end_time) else end_time
+  engine.load_squares(mines, square_states)
+
+
+def invalid_column(row, codes):
+  """ Returns the column of the first value in row that has no code (only used for error messages)."""
+  for column, value in enumerate(row):
+    try:
+      if type(value) not in (int, str) or value not in codes:
+        return column
+    except TypeError: # Unhashable value
+      return column
+
+
+def verify_json(engine, save_data):
+  """ Verifies the data from a JSON save file in one pass over the rows.
+  Returns the mines, square states and counts bytearrays, or raises ValueError naming the invalid field."""
+  # Fields and their types
+  if type(save_data) is not dict:
+    raise ValueError("Save data is not an object")
+  for field, field_type in JSON_FIELD_TYPES.items():
+    if field not in save_data:
+      raise ValueError(f"Missing {field}")
+    if type(save_data[field]) is not field_type:
+      raise ValueError(f"Invalid {field} (should be {field_type.__name__})")
+
+  # Difficulty and board size
+  if save_data["game_difficulty"] not in engine.difficulties:
+    raise ValueError("Invalid game_difficulty")
+
+  board_size = save_data["board_size"]
+  if len(board_size) != 2 or any(type(dimension) is not int or dimension < 1 for dimension in board_size):
+    raise ValueError("Invalid board_size")
+  rows, columns = board_size
+
+  states = save_data["states"]
+  board = save_data["board"]
+  if len(states) != rows:
+    raise ValueError(f"Invalid states (should have {rows} rows)")
+  if len(board) != rows:
+    raise ValueError(f"Invalid board (should have {rows} rows)")
+
+  # JSON keys are strings, states are read as their codes and board values as 0-8 or BOMB_CODE
+  column_keys = [str(j) for j in range(columns)]
+  state_codes = {state : code for code, state in enumerate(engine.state_options)}
+  value_codes = {number : number for number in range(9)}
+  value_codes[engine.BOMB_IDENTIFIER] = BOMB_CODE
+
+  # Converts every row to codes (each row in C - only invalid rows are searched square by square)
+  square_states = bytearray()
+  values = bytearray()
+  for i in range(rows):
+    state_row = states.get(str(i))
+    board_row = board[i]
+
+    # States row - columns in order, or reordered if the keys are right but out of order
+    if type(state_row) is not dict or len(state_row) != columns:
+      raise ValueError(f"Invalid states[{i}] (should have {columns} columns)")
+    if list(state_row) == column_keys:
+      state_row = state_row.values()
+    else:
+      state_row = [state_row.get(key) for key in column_keys]
+
+    try:
+      square_states += bytes(map(state_codes.__getitem__, state_row))
+    except (KeyError, TypeError):
+      raise ValueError(f"Invalid states[{i}][{invalid_column(state_row, state_codes)}]")
+
+    # Board row - only ints and the bomb identifier
+    if type(board_row) is not list or len(board_row) != columns:
+      raise ValueError(f"Invalid board[{i}] (should have {columns} columns)")
+
+    try:
+      if not set(map(type, board_row)) <= {int, str}:
+        raise KeyError
+      values += bytes(map(value_codes.__getitem__, board_row))
+    except (KeyError, TypeError):
+      raise ValueError(f"Invalid board[{i}][{invalid_column(board_row, value_codes)}]")
+
+  mines = values.translate(MINE_BYTES)
+  verify_squares(engine, mines, square_states, save_data["bomb_count"], save_data["flag_count"], save_data["uncover_count"])
+
+  # Every number matches its surrounding bombs (compared with bombs masked out, as whole integers)
+  counts = bomb_counts(mines, (rows, columns))
+  not_mines = int.from_bytes(mines.translate(NOT_MINE_MASK), "big")
+  if int.from_bytes(counts, "big") & not_mines != int.from_bytes(values.translate(NUMBER_BYTES), "big"):
+    raise ValueError("Invalid board (numbers do not match the bombs)")
+
+  return mines, square_states, counts
+
+
+def verify_squares(engine, mines, square_states, bomb_count, flag_count, uncover_count, running=True, lost=False):
+  """ Verifies a game's counts match its mines and square states bytearrays, or raises ValueError naming the invalid field.
+  Games in progress can't have incorrect flags or uncovered bombs (a lost game shows them)."""
+  # Bombs match bomb_count, flags match flag_count
+  if mines.count(1) != bomb_count:
+    raise ValueError(f"Invalid bomb_count (board has {mines.count(1)} bombs)")
+
+  flags = square_states.translate(FLAG_BITS).count(1)
+  if flag_count != bomb_count - flags:
+    raise ValueError(f"Invalid flag_count (board has {flags} flags)")
+
+  # A game in progress has no incorrect flags or uncovered bombs
+  uncovered = int.from_bytes(square_states.translate(UNCOVERED_BITS), "big")
+  uncovered_bombs = (uncovered & int.from_bytes(mines, "big")).bit_count()
+  if running and engine.INCORRECT_FLAGGED in square_states:
+    raise ValueError("Invalid states (incorrect flag in a game in progress)")
+  if running and uncovered_bombs:
+    raise ValueError("Invalid states (uncovered bomb in a game in progress)")
+
+  # uncover_count matches the covered non-bombs (the bomb that lost a game was counted as uncovered)
+  covered_count = len(mines) - bomb_count - (uncovered.bit_count() - uncovered_bombs) - lost
+  if uncover_count != covered_count:
+    raise ValueError(f"Invalid uncover_count (board has {covered_count} covered non-bombs)")
+
+
+def load_json(engine, save_data):
+  """ Verifies the data from a JSON save file and loads it into the engine. Raises ValueError naming the invalid field."""
+  mines, square_states, counts = verify_json(engine, save_data)
+  engine.load_data(save_data, mines, square_states, counts)
@@ -0,0 +1,197 @@
+_author_ = "Asif Rahman"
+_date_ = "Saturday, October 17, 2026"
+_version_ = "1.0"
+_filename_ = "simulator.py"
+_description_ = "Minesweeper game simulator. Plays games with a bot strategy on every core and streams each result to a CSV file."
+
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+from engine import Engine
+from engine import NewEngine
+from engine import SEED_BITS
+import argparse
+import csv
+import importlib
+import os
+import random
+import solver
+import time
+
+# Games each task plays, and tasks kept in flight for every worker (so results are written as they come, in constant memory)
+GAMES_PER_TASK = 500
+TASKS_PER_WORKER = 2
+
+# Random squares tried before a guess looks through every square
+GUESS_TRIES = 64
+
+# Columns of the results file
+RESULT_FIELDS = ("board", "game", "board_code", "won", "moves", "three_bv")
+
+
+def random_covered(engine, rng, avoid=()):
+  """ Returns a random covered square that isn't in avoid (None if there isn't one)."""
+  columns = engine.board_size[1]
+  square_count = len(engine.square_states)
+
+  for attempt in range(GUESS_TRIES):
+    square = divmod(rng.randrange(square_count), columns)
+    if engine.square_state(*square) == engine.COVERED and square not in avoid:
+      return square
+
+  # Few covered squares left - picks from all of them
+  covered = [divmod(index, columns) for index in range(square_count) if engine.square_states[index] == engine.COVERED]
+  covered = [square for square in covered if square not in avoid]
+  return rng.choice(covered) if covered else None
+
+
+def random_strategy(engine, rng):
+  """ Uncovers a random covered square."""
+  return [(engine.state_options[1], random_covered(engine, rng))]
+
+
+def solver_strategy(engine, rng):
+  """ Clicks the middle first, then uncovers every square the solver finds safe. If it finds none, guesses a random covered
+  square it doesn't know to be a bomb."""
+  rows, columns = engine.board_size
+  if not engine.clicked:
+    return [(engine.state_options[1], (rows // 2, columns // 2))]
+
+  safe, mines = solver.solve(engine)
+  if not safe:
+    safe = [random_covered(engine, rng, mines) or random_covered(engine, rng)]
+  return [(engine.state_options[1], square) for square in safe]
+
+
+# Strategies by name - any other strategy is given as module:function
+STRATEGIES = {
+  "random" : random_strategy,
+  "solver" : solver_strategy,
+}
+
+
+def load_strategy(name):
+  """ Returns the strategy function for a built-in name or a module:function path.
+  A strategy is called with the engine and a random.Random, and returns a list of (new_state, (row, column)) moves."""
+  if name in STRATEGIES:
+    return STRATEGIES[name]
+
+  module_name, separator, function_name = name.partition(":")
+  if not separator:
+    raise ValueError(f"Unknown strategy {name} (use {', '.join(STRATEGIES)} or module:function)")
+  return getattr(importlib.import_module(module_name), function_name)
+
+
+def parse_board(text):
+  """ Returns the board size and bomb count of a difficulty name or a ROWSxCOLUMNS-BOMBS custom size.
+  Raises ValueError if it is neither."""
+  if text in Engine.difficulties and text != "custom":
+    settings = Engine.difficulties[text]
+    return tuple(settings["board_size"]), settings["bomb_count"]
+
+  try:
+    size, bomb_count = text.split("-")
+    rows, columns = size.split("x")
+    board_size, bomb_count = (int(rows), int(columns)), int(bomb_count)
+  except ValueError:
+    raise ValueError(f"Board {text} is not a difficulty or ROWSxCOLUMNS-BOMBS") from None
+
+  if min(board_size) < 1 or not 0 <= bomb_count < board_size[0] * board_size[1]:
+    raise ValueError(f"Board {text} needs at least one row, column and non-bomb square")
+  return board_size, bomb_count
+
+
+def play_game(engine, strategy, rng):
+  """ Plays a game to the end with the strategy, making each turn's moves in one batch. Returns whether it was won and the
+  number of moves made. Raises ValueError if the strategy's moves don't change the board (the game would never end)."""
+  moves = 0
+  while engine.running:
+    turn = strategy(engine, rng)
+    moves += len(turn)
+    if not engine.apply_moves(turn):
+      raise ValueError("Strategy made no progress")
+
+  return engine.game_won, moves
+
+
+def play_games(board, board_size, bomb_count, strategy_name, base_seed, start, count):
+  """ Plays games start to start + count of a board. Runs in the worker processes.
+  Returns a results file row for every game. Every game's seed comes from base_seed, the board and the game number,
+  so the same run always plays the same games."""
+  strategy = load_strategy(strategy_name)
+  difficulty = Engine.difficulty_for(board_size, bomb_count)
+
+  rows = []
+  for game_number in range(start, start + count):
+    rng = random.Random(f"{base_seed}:{board}:{game_number}")
+    engine = NewEngine(difficulty, seed=rng.getrandbits(SEED_BITS), board_size=board_size, bomb_count=bomb_count)
+    won, moves = play_game(engine, strategy, rng)
+    rows.append((board, game_number, engine.board_code, int(won), moves, engine.three_bv))
+  return rows
+
+
+def simulate(boards, games, strategy_name, base_seed, output_path, workers):
+  """ Plays games of every board on worker processes, writing every result to output_path as it comes.
+  Returns (board, games, wins, total moves, seconds) for each board."""
+  load_strategy(strategy_name)
+  summaries = []
+
+  with ProcessPoolExecutor(workers) as executor, open(output_path, "w", newline="") as output_file:
+    writer = csv.writer(output_file)
+    writer.writerow(RESULT_FIELDS)
+
+    for board in boards:
+      board_size, bomb_count = parse_board(board)
+      start_time = time.perf_counter()
+      in_flight = set()
+      next_game = 0
+      wins = 0
+      total_moves = 0
+
+      # Keeps every worker busy, writing each task's results as soon as it finishes
+      while next_game < games or in_flight:
+        while next_game < games and len(in_flight) < TASKS_PER_WORKER * workers:
+          count = min(GAMES_PER_TASK, games - next_game)
+          in_flight.add(executor.submit(play_games, board, board_size, bomb_count, strategy_name, base_seed, next_game, count))
+          next_game += count
+
+        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+          rows = future.result()
+          writer.writerows(rows)
+          wins += sum(row[3] for row in rows)
+          total_moves += sum(row[4] for row in rows)
+
+      summaries.append((board, games, wins, total_moves, time.perf_counter() - start_time))
+
+  return summaries
+
+
+def main(arguments=None):
+  """ Runs the simulator from the command line and prints each board's results."""
+  parser = argparse.ArgumentParser(description="Plays Minesweeper games with a bot strategy on every core.")
+  parser.add_argument("boards", nargs="+", help="difficulties (easy, intermediate, expert) or custom sizes as ROWSxCOLUMNS-BOMBS")
+  parser.add_argument("-n", "--games", type=int, default=1000, help="games to play on each board (default 1000)")
+  parser.add_argument("-s", "--strategy", default="solver", help=f"{', '.join(STRATEGIES)} or module:function (default solver)")
+  parser.add_argument("--seed", type=int, default=0, help="seed the games are generated from (default 0)")
+  parser.add_argument("-o", "--output", default="simulation.csv", help="CSV file every game's result is written to")
+  parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default every core)")
+  options = parser.parse_args(arguments)
+
+  if options.games < 1 or options.workers < 1:
+    parser.error("games and workers must be at least 1")
+  try:
+    for board in options.boards:
+      parse_board(board)
+    load_strategy(options.strategy)
+  except (ValueError, ImportError, AttributeError) as error:
+    parser.error(str(error))
+
+  for board, games, wins, total_moves, seconds in simulate(options.boards, options.games, options.strategy, options.seed,
+                                                           options.output, options.workers):
+    print(f"{board}: {games} games, {wins / games:.2%} won, {total_moves / games:.1f} moves per game, "
+          f"{games / seconds:.1f} games/s")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,353 @@
+_author_ = "Asif Rahman"
+_date_ = "Saturday, October 17, 2026"
+_version_ = "1.0"
+_filename_ = "solver.py"
+_description_ = "Minesweeper solver. Finds the covered squares that are certainly safe or certainly bombs from what the player can see."
+
+from engine import Engine
+from engine import bomb_counts
+from engine import neighbours
+from engine import neighbour_table
+from functools import lru_cache
+from itertools import compress
+
+# Biggest frontier component (in covered squares) whose layouts are enumerated
+MAX_COMPONENT_SQUARES = 40
+
+# Biggest board (in squares) whose masks have a bit for every square (bigger boards only number their frontier squares),
+# and how many board sizes have their neighbour masks cached
+FLAT_MAX_SQUARES = 10000
+NEIGHBOUR_MASK_CACHE_SIZE = 8
+
+# Square state codes to 1 for covered squares (flags included), and to 0xff for uncovered squares
+COVERED_BYTES = bytes.maketrans(b"\x00\x01\x02\x03", b"\x01\x00\x01\x01")
+TO_BITS = bytes.maketrans(b"\x00\x01", b"01")
+UNCOVERED_MASK = bytes.maketrans(b"\x00\x01\x02\x03", b"\x00\xff\x00\x00")
+
+
+def solve(engine):
+  """ Returns the sets of covered squares (row, column) of an engine's game that are certainly safe and certainly bombs.
+  Only uses what the player can see - uncovered numbers and the bomb count (flags are treated as covered squares)."""
+  return solve_grids(engine.board_size, engine.square_states, engine.counts, engine.bomb_count)
+
+
+def solve_many(engines):
+  """ Returns the safe and bomb squares of every engine's game, in order. Boards of the same size share one neighbour table."""
+  return [solve_grids(engine.board_size, engine.square_states, engine.counts, engine.bomb_count) for engine in engines]
+
+
+def solve_grids(board_size, square_states, counts, bomb_count=None):
+  """ Returns the sets of certainly safe and certainly bomb squares (row, column) given flat square state codes and counts
+  (the engine's layout). Without a bomb_count, the total number of bombs isn't used."""
+  columns = board_size[1]
+  constraints, squares, covered_count = frontier(board_size, square_states, counts)
+  safe, mines, constraints = propagate(constraints)
+
+  # Enumerating a component finds everything the subset rules would, so they are only used to break up components
+  # too big to enumerate
+  while True:
+    components = split_components(constraints)
+    too_big = {}
+    for component_mask, component in components:
+      if component_mask.bit_count() > MAX_COMPONENT_SQUARES:
+        too_big.update(component)
+
+    found_safe, found_mines, derived = subset_rules(too_big)
+    if not found_safe and not found_mines and not derived:
+      break
+    constraints.update(derived)
+    safe, mines, constraints = propagate(constraints, safe | found_safe, mines | found_mines)
+
+  # Whole layouts of every frontier component that the rules couldn't solve
+  remaining = None if bomb_count is None else bomb_count - mines.bit_count()
+  frontier_mask = safe | mines
+  for component_mask, component in components:
+    frontier_mask |= component_mask
+  interior_count = covered_count - frontier_mask.bit_count()
+  component_safe, component_mines, interior = enumerate_components(components, remaining, interior_count)
+  safe |= component_safe
+  mines |= component_mines
+
+  safe_squares = {divmod(squares[bit.bit_length() - 1], columns) for bit in bits(safe)}
+  mine_squares = {divmod(squares[bit.bit_length() - 1], columns) for bit in bits(mines)}
+
+  # Covered squares that no number touches are all safe or all bombs when the bomb count leaves no other choice
+  if interior is not None:
+    frontier_squares = {squares[bit.bit_length() - 1] for bit in bits(frontier_mask)}
+    interior_squares = {divmod(index, columns) for index in range(len(square_states))
+                        if square_states[index] != Engine.UNCOVERED and index not in frontier_squares}
+    (safe_squares if interior == "safe" else mine_squares).update(interior_squares)
+
+  return safe_squares, mine_squares
+
+
+def bits(mask):
+  """ Yields every set bit of an integer mask (as an integer with only that bit set)."""
+  while mask:
+    bit = mask & -mask
+    yield bit
+    mask ^= bit
+
+
+@lru_cache(maxsize=NEIGHBOUR_MASK_CACHE_SIZE)
+def neighbour_masks(board_size):
+  """ Returns a tuple with a mask of every square's neighbours (bit n for flat index n). Cached per board size."""
+  return tuple(sum(1 << neighbour for neighbour in square_neighbours) for square_neighbours in neighbour_table(board_size))
+
+
+def frontier(board_size, square_states, counts):
+  """ Returns the constraints of every uncovered number next to covered squares as a dictionary of
+  covered square mask : bombs among them, the flat index of each mask bit, and the number of covered squares.
+  Small boards use bit n for flat index n, so each constraint is one AND with a neighbour mask. Covered squares of
+  bigger boards are numbered in the order they are found instead, so masks stay small."""
+  # Uncovered squares next to a covered square - the covered squares around every square are counted like bombs (in C)
+  covered = square_states.translate(COVERED_BYTES)
+  covered_around = int.from_bytes(bomb_counts(covered, board_size), "big")
+  boundary = (covered_around & int.from_bytes(square_states.translate(UNCOVERED_MASK), "big")).to_bytes(len(covered), "big")
+  covered_count = covered.count(1)
+
+  # Bit n of covered_bits is square n (the bit string is reversed, as int reads the last character as bit 0)
+  if len(covered) <= FLAT_MAX_SQUARES:
+    masks = neighbour_masks(tuple(board_size))
+    covered_bits = int(covered.translate(TO_BITS)[::-1], 2)
+    constraints = {masks[index] & covered_bits : counts[index] for index in compress(range(len(boundary)), boundary)}
+    return constraints, range(len(covered)), covered_count
+
+  surrounding = neighbours(board_size)
+  uncovered = Engine.UNCOVERED
+  bit_numbers = {}
+  squares = []
+  constraints = {}
+
+  for index in compress(range(len(boundary)), boundary):
+    mask = 0
+    for neighbour in surrounding[index]:
+      if square_states[neighbour] != uncovered:
+        bit = bit_numbers.get(neighbour)
+        if bit is None:
+          bit = bit_numbers[neighbour] = 1 << len(squares)
+          squares.append(neighbour)
+        mask |= bit
+
+    constraints[mask] = counts[index]
+
+  return constraints, squares, covered_count
+
+
+def propagate(constraints, safe=0, mines=0):
+  """ Applies the single square rules (a number with all its bombs found, or as many bombs as covered squares) until
+  nothing changes, starting from the known safe and bomb masks. Returns the new masks and the constraints left unsolved."""
+  changed = True
+  while changed:
+    changed = False
+    reduced = {}
+
+    # Known squares are taken out of every constraint (squares found earlier in the same pass included)
+    for mask, count in constraints.items():
+      known_mines = mask & mines
+      if known_mines:
+        count -= known_mines.bit_count()
+        mask ^= known_mines
+      mask &= ~safe
+
+      if not mask:
+        continue
+      if count == 0:
+        safe |= mask
+        changed = True
+      elif count == mask.bit_count():
+        mines |= mask
+        changed = True
+      else:
+        reduced[mask] = count
+    constraints = reduced
+
+  return safe, mines, constraints
+
+
+def subset_rules(constraints):
+  """ Applies the subset rules to every pair of constraints that share a square - a number's squares inside another's
+  leave the difference of their bombs in the rest, and a number that needs as many more bombs than an overlapping one as
+  it has squares of its own has bombs in all of them. Returns the safe and bomb masks found and the derived constraints."""
+  safe = 0
+  mines = 0
+  derived = {}
+
+  # Pairs are found through the constraints of each square
+  by_square = {}
+  for mask in constraints:
+    for bit in bits(mask):
+      by_square.setdefault(bit, []).append(mask)
+
+  checked = set()
+  for masks in by_square.values():
+    for first in masks:
+      for second in masks:
+        if first == second or (first, second) in checked:
+          continue
+        checked.add((first, second))
+        first_count, second_count = constraints[first], constraints[second]
+        only_first, only_second = first & ~second, second & ~first
+
+        # The first's squares are all in the second - the rest of the second has the difference
+        if not only_first:
+          if only_second not in constraints:
+            derived[only_second] = second_count - first_count
+
+        # The second's own squares are all bombs and the first's own squares are all safe
+        elif second_count - first_count == only_second.bit_count():
+          mines |= only_second
+          safe |= only_first
+
+  return safe, mines, derived
+
+
+def enumerate_components(components, remaining=None, interior_count=0):
+  """ Enumerates every bomb layout of each independent group of constraints (see split_components) that isn't too big.
+  Returns the safe and bomb masks that hold in every layout, and "safe" or "mines" if the squares no number touches
+  must all be safe or all be bombs (None otherwise). remaining is the number of bombs left, if known."""
+  # Bomb counts of each component's layouts, and the squares safe or bombs in every layout with that count
+  results = []
+  for component_mask, component in components:
+    if component_mask.bit_count() > MAX_COMPONENT_SQUARES:
+      results.append(None)
+    else:
+      results.append(enumerate_layouts(component_mask, component))
+
+  safe = 0
+  mines = 0
+  if remaining is None:
+    for result in results:
+      if result:
+        safe |= all_of(result, "safe")
+        mines |= all_of(result, "mines")
+    return safe, mines, None
+
+  # Totals that the other components can reach (components that were too big could have any count)
+  bounds = [(0, component_mask.bit_count()) if result is None else (min(result), max(result))
+            for (component_mask, component), result in zip(components, results)]
+  low, high = sum(bound[0] for bound in bounds), sum(bound[1] for bound in bounds)
+  for result, (bound_low, bound_high) in zip(results, bounds):
+    if not result:
+      continue
+
+    # A bomb count is only possible if the other components and the interior can make up the rest
+    other_low, other_high = low - bound_low, high - bound_high
+    possible = {count : layouts for count, layouts in result.items()
+                if other_low <= remaining - count <= other_high + interior_count}
+    if possible:
+      safe |= all_of(possible, "safe")
+      mines |= all_of(possible, "mines")
+
+  # The interior has every bomb the frontier doesn't
+  interior = None
+  if interior_count:
+    if low >= remaining:
+      interior = "safe"
+    elif remaining - high == interior_count:
+      interior = "mines"
+  return safe, mines, interior
+
+
+def all_of(result, kind):
+  """ Returns the squares that are safe (or bombs) in every layout of a component, whatever its bomb count."""
+  mask = -1
+  for safe, mines in result.values():
+    mask &= safe if kind == "safe" else mines
+  return max(mask, 0)
+
+
+def split_components(constraints):
+  """ Returns the independent groups of constraints as (mask of their squares, {mask : count}) pairs."""
+  components = []
+  for mask, count in constraints.items():
+
+    # Merges every group that shares a square with the constraint
+    merged_mask = mask
+    merged = {mask : count}
+    unmerged = []
+    for component_mask, component in components:
+      if component_mask & mask:
+        merged_mask |= component_mask
+        merged.update(component)
+      else:
+        unmerged.append((component_mask, component))
+
+    unmerged.append((merged_mask, merged))
+    components = unmerged
+
+  return components
+
+
+def component_classes(component_mask, constraints):
+  """ Returns a component's classes of interchangeable squares (masks of squares in exactly the same constraints) and
+  the numbers of the constraints each class is in (constraints numbered in their dictionary order).
+  Each class comes next to the ones before it (the class in the most constraints already started), so constraints are
+  finished as soon as possible."""
+  masks = list(constraints)
+
+  # Splits the component's squares by every constraint (each class is inside or outside every constraint)
+  classes = [component_mask]
+  for mask in masks:
+    classes = [part for whole in classes for part in (whole & mask, whole & ~mask) if part]
+  class_constraints = [[number for number, mask in enumerate(masks) if mask & part] for part in classes]
+
+  order = []
+  started = set()
+  unordered = set(range(len(classes)))
+  while unordered:
+    position = max(unordered, key=lambda position: (len(started.intersection(class_constraints[position])), -position))
+    unordered.remove(position)
+    order.append(position)
+    started.update(class_constraints[position])
+
+  return [classes[position] for position in order], [class_constraints[position] for position in order]
+
+
+def enumerate_layouts(component_mask, constraints):
+  """ Backtracks through every bomb layout of a component that satisfies its constraints. Squares in exactly the same
+  constraints are interchangeable, so layouts are enumerated as the number of bombs in each class of them.
+  Returns a dictionary of bomb count : (squares safe in every layout with that count, squares that are always bombs)."""
+  masks = list(constraints)
+  classes, class_constraints = component_classes(component_mask, constraints)
+  class_sizes = [part.bit_count() for part in classes]
+
+  needed = [constraints[mask] for mask in masks]
+  unassigned = [mask.bit_count() for mask in masks]
+  results = {}
+  end = len(classes)
+
+  def search(position, safe, mines, count):
+    """ Tries every number of bombs in the class at position."""
+    if position == end:
+      if count in results:
+        result_safe, result_mines = results[count]
+        results[count] = (result_safe & safe, result_mines & mines)
+      else:
+        results[count] = (safe, mines)
+      return
+
+    numbers = class_constraints[position]
+    size = class_sizes[position]
+    part = classes[position]
+    low = 0
+    high = size
+    for number in numbers:
+      unassigned[number] -= size
+      if needed[number] - unassigned[number] > low:
+        low = needed[number] - unassigned[number]
+      if needed[number] < high:
+        high = needed[number]
+
+    for bombs in range(low, high + 1):
+      for number in numbers:
+        needed[number] -= bombs
+      search(position + 1, safe | part if bombs == 0 else safe, mines | part if bombs == size else mines, count + bombs)
+      for number in numbers:
+        needed[number] += bombs
+
+    for number in numbers:
+      unassigned[number] += size
+
+  search(0, 0, 0, 0)
+  return results
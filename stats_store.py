@@ -0,0 +1,123 @@
+_author_ = "Asif Rahman"
+_date_ = "Saturday, October 17, 2026"
+_version_ = "1.0"
+_filename_ = "stats_store.py"
+_description_ = "Minesweeper stats store. Records every finished game in a SQLite database and answers stats queries from its indexes."
+
+import os
+import sqlite3
+
+# Where the stats database is kept
+STATS_PATH = os.path.join(os.path.expanduser("~"), ".minesweeper", "stats.sqlite3")
+
+# Version of the tables below (kept in the database's user_version)
+SCHEMA_VERSION = 1
+
+# Every game, with its win streak (wins in a row of the same board up to and including it) so streaks are one lookup.
+# Queries are always for one board (difficulty, size and bomb count), which every index starts with.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+  id INTEGER PRIMARY KEY,
+  difficulty TEXT NOT NULL,
+  row_count INTEGER NOT NULL,
+  column_count INTEGER NOT NULL,
+  bomb_count INTEGER NOT NULL,
+  start_time REAL NOT NULL,
+  end_time REAL NOT NULL,
+  duration REAL NOT NULL,
+  won INTEGER NOT NULL,
+  moves INTEGER NOT NULL,
+  streak INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_by_result ON games (difficulty, row_count, column_count, bomb_count, won, duration);
+CREATE INDEX IF NOT EXISTS games_by_order ON games (difficulty, row_count, column_count, bomb_count, id);
+CREATE INDEX IF NOT EXISTS games_by_streak ON games (difficulty, row_count, column_count, bomb_count, streak);
+"""
+
+# Condition selecting one board's games
+BOARD = "difficulty = ? AND row_count = ? AND column_count = ? AND bomb_count = ?"
+
+
+class StatsStore:
+  """ Every finished game in a SQLite database. Stats are per board - difficulty, board size and bomb count."""
+
+  def __init__(self, path=STATS_PATH):
+    """ Opens the database, creating it if needed. Raises sqlite3.Error or OSError if it can't be opened."""
+    if path != ":memory:":
+      os.makedirs(os.path.dirname(path), exist_ok=True)
+    self.connection = sqlite3.connect(path)
+
+    version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+    if version > SCHEMA_VERSION:
+      raise sqlite3.DatabaseError(f"Unsupported stats database version {version}")
+    self.connection.executescript(SCHEMA)
+    self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    self.connection.commit()
+
+  def board_key(self, difficulty, board_size, bomb_count):
+    """ Returns the query parameters selecting a board's games."""
+    return (difficulty, board_size[0], board_size[1], bomb_count)
+
+  def record(self, difficulty, board_size, bomb_count, start_time, end_time, won, moves):
+    """ Records a finished game."""
+    key = self.board_key(difficulty, board_size, bomb_count)
+    streak = 0
+    if won:
+      streak = self.current_streak(difficulty, board_size, bomb_count) + 1
+
+    with self.connection:
+      self.connection.execute(
+        "INSERT INTO games (difficulty, row_count, column_count, bomb_count, start_time, end_time, duration, won, moves, streak)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        key + (start_time, end_time, end_time - start_time, int(bool(won)), moves, streak))
+
+  def record_engine(self, engine, moves):
+    """ Records an engine's finished game, made in the given number of moves (clicks - a chord is one move)."""
+    self.record(engine.game_difficulty, engine.board_size, engine.bomb_count, engine.start_time, engine.end_time,
+                engine.game_won, moves)
+
+  def results(self, difficulty, board_size, bomb_count):
+    """ Returns the number of games played and won."""
+    key = self.board_key(difficulty, board_size, bomb_count)
+    wins = self.connection.execute(f"SELECT COUNT(*) FROM games WHERE {BOARD} AND won = 1", key).fetchone()[0]
+    games = self.connection.execute(f"SELECT COUNT(*) FROM games WHERE {BOARD}", key).fetchone()[0]
+    return games, wins
+
+  def best_times(self, difficulty, board_size, bomb_count, count=3):
+    """ Returns the count fastest winning times (in seconds), fastest first."""
+    key = self.board_key(difficulty, board_size, bomb_count)
+    rows = self.connection.execute(f"SELECT duration FROM games WHERE {BOARD} AND won = 1 ORDER BY duration LIMIT ?",
+                                   key + (count,))
+    return [duration for duration, in rows]
+
+  def time_percentiles(self, difficulty, board_size, bomb_count, fractions=(0.5, 0.9)):
+    """ Returns the winning time at each fraction (0 to 1) of the wins, or None for each if there are none.
+    Each is one step through the index by its offset."""
+    key = self.board_key(difficulty, board_size, bomb_count)
+    wins = self.connection.execute(f"SELECT COUNT(*) FROM games WHERE {BOARD} AND won = 1", key).fetchone()[0]
+    if not wins:
+      return [None] * len(fractions)
+
+    percentiles = []
+    for fraction in fractions:
+      offset = min(wins - 1, int(fraction * wins))
+      percentiles.append(self.connection.execute(
+        f"SELECT duration FROM games WHERE {BOARD} AND won = 1 ORDER BY duration LIMIT 1 OFFSET ?",
+        key + (offset,)).fetchone()[0])
+    return percentiles
+
+  def current_streak(self, difficulty, board_size, bomb_count):
+    """ Returns the wins in a row up to the last game."""
+    key = self.board_key(difficulty, board_size, bomb_count)
+    row = self.connection.execute(f"SELECT streak FROM games WHERE {BOARD} ORDER BY id DESC LIMIT 1", key).fetchone()
+    return row[0] if row else 0
+
+  def best_streak(self, difficulty, board_size, bomb_count):
+    """ Returns the most wins in a row."""
+    key = self.board_key(difficulty, board_size, bomb_count)
+    row = self.connection.execute(f"SELECT streak FROM games WHERE {BOARD} ORDER BY streak DESC LIMIT 1", key).fetchone()
+    return row[0] if row else 0
+
+  def close(self):
+    """ Closes the database."""
+    self.connection.close()
@@ -0,0 +1,240 @@
+_author_ = "Asif Rahman"
+_date_ = "Saturday, October 17, 2026"
+_version_ = "1.0"
+_filename_ = "test_engine.py"
+_description_ = "Engine tests. Bomb counts of the pure Python and NumPy paths match each other and a square by square count, board codes keep their bombs, and batches of moves and chords change the right squares."
+
+import hashlib
+import random
+import time
+import unittest
+
+from engine import Engine
+from engine import NewEngine
+from engine import bomb_counts
+from engine import bomb_counts_numpy
+from engine import bomb_counts_python
+from engine import decode_board_code
+from engine import numpy
+
+# Board sizes counted - single squares, single rows and columns, and ordinary boards
+BOARD_SIZES = ((1, 1), (1, 2), (2, 1), (1, 37), (37, 1), (2, 2), (3, 3), (8, 8), (16, 30), (30, 16), (101, 3), (3, 101))
+
+# Board codes, first clicks and the start of the SHA-256 of the bombs they gave before boards were prepared in the background
+BOARD_CODES = (
+  ("8x8-10-9ix", (4, 4), "536b5c64a4c76f8d"),
+  ("16x16-40-1ka", (0, 0), "26279859bd8c1faa"),
+  ("16x30-99-gc0uy9", (8, 15), "744c8e54c478b281"),
+  ("16x30-99-5", (15, 29), "cd0709705b561861"),
+)
+
+
+def random_mines(board_size, rng):
+  """ Returns a random mines bytearray for the board size, with any density from empty to full."""
+  density = rng.random()
+  return bytearray(rng.random() < density for index in range(board_size[0] * board_size[1]))
+
+
+def square_counts(mines, board_size):
+  """ Returns the bomb counts of every square, worked out one square at a time by NewEngine.get_surrounding_bombs."""
+  game = NewEngine("custom", board_size=board_size, bomb_count=0)
+  game.mines = mines
+  rows, columns = board_size
+  return bytearray(game.get_surrounding_bombs(i, j) for i in range(rows) for j in range(columns))
+
+
+class BombCountsTest(unittest.TestCase):
+  """ Whole board bomb counts."""
+
+  def test_python_matches_square_counts(self):
+    """ The pure Python path gives every square's count on random boards of every shape."""
+    rng = random.Random(0)
+    for board_size in BOARD_SIZES:
+      for trial in range(20):
+        mines = random_mines(board_size, rng)
+        with self.subTest(board_size=board_size, trial=trial):
+          self.assertEqual(bomb_counts_python(mines, board_size), square_counts(mines, board_size))
+
+  def test_full_and_empty_boards(self):
+    """ Counts of boards with no bombs and with every square a bomb (the largest counts, 9)."""
+    for board_size in BOARD_SIZES:
+      squares = board_size[0] * board_size[1]
+      with self.subTest(board_size=board_size):
+        self.assertEqual(bomb_counts(bytearray(squares), board_size), bytearray(squares))
+        self.assertEqual(bomb_counts(bytearray([1]) * squares, board_size), square_counts(bytearray([1]) * squares, board_size))
+
+  @unittest.skipIf(numpy is None, "NumPy is not installed")
+  def test_numpy_matches_python(self):
+    """ The NumPy path gives the same counts as the pure Python path on random boards of every shape."""
+    rng = random.Random(1)
+    for board_size in BOARD_SIZES + ((200, 300),):
+      for trial in range(20):
+        mines = random_mines(board_size, rng)
+        with self.subTest(board_size=board_size, trial=trial):
+          self.assertEqual(bomb_counts_numpy(mines, board_size), bomb_counts_python(mines, board_size))
+
+
+def coded_game(code):
+  """ Returns a new game of the board code."""
+  board_size, bomb_count, seed = decode_board_code(code)
+  return NewEngine(Engine.difficulty_for(board_size, bomb_count), seed=seed, board_size=board_size, bomb_count=bomb_count)
+
+
+def mines_digest(game):
+  """ Returns the start of the SHA-256 of the game's bombs."""
+  return hashlib.sha256(bytes(game.mines)).hexdigest()[:16]
+
+
+class BoardCodeTest(unittest.TestCase):
+  """ Bombs of seeded boards, cold and prepared."""
+
+  def test_codes_keep_their_bombs(self):
+    """ A code and first click give the same bombs they always have, whether or not the board was prepared."""
+    for code, square, digest in BOARD_CODES:
+      cold = coded_game(code)
+      cold.move("uncovered", square)
+
+      prepared = coded_game(code)
+      prepared.prepare()
+      game = NewEngine(prepared.game_difficulty, board_size=prepared.board_size, bomb_count=prepared.bomb_count)
+      game.use_prepared(prepared)
+      game.move("uncovered", square)
+
+      with self.subTest(code=code, square=square):
+        self.assertEqual(mines_digest(cold), digest)
+        self.assertEqual(mines_digest(game), digest)
+
+  def test_custom_codes_leave_custom_settings(self):
+    """ Boards of codes no difficulty has are custom games of the code's size, and the custom settings are unchanged."""
+    custom = Engine.difficulties["custom"]
+    settings = (list(custom["board_size"]), custom["bomb_count"])
+    game = coded_game("20x24-70-1ka")
+    self.assertEqual((game.game_difficulty, game.board_size, game.bomb_count), ("custom", (20, 24), 70))
+    self.assertEqual((custom["board_size"], custom["bomb_count"]), settings)
+
+  def test_prepared_boards_match_cold_boards(self):
+    """ Prepared boards clicked anywhere have the same bombs, counts and openings as boards placed on the click."""
+    rng = random.Random(2)
+    for trial in range(200):
+      board_size = (rng.randint(1, 30), rng.randint(2, 30))
+      squares = board_size[0] * board_size[1]
+      board = {"board_size" : board_size, "bomb_count" : rng.randint(1, squares - 1)}
+      seed = rng.getrandbits(40)
+      square = (rng.randrange(board_size[0]), rng.randrange(board_size[1]))
+
+      cold = NewEngine("custom", seed=seed, **board)
+      cold.move("uncovered", square)
+      prepared = NewEngine("custom", seed=seed, **board)
+      prepared.prepare()
+      game = NewEngine("custom", **board)
+      game.use_prepared(prepared)
+      game.move("uncovered", square)
+
+      with self.subTest(trial=trial, board_size=board_size, square=square):
+        self.assertEqual(game.mines, cold.mines)
+        self.assertEqual(game.counts, cold.counts)
+        self.assertEqual(game.square_states, cold.square_states)
+        self.assertEqual((game.three_bv, game.opening_count, game.island_count),
+                         (cold.three_bv, cold.opening_count, cold.island_count))
+
+
+def picture_game(picture):
+  """ Returns a clicked game in progress with bombs where the picture's rows have a *, every square covered."""
+  game = Engine()
+  mines = bytearray(character == "*" for row in picture for character in row)
+  game.running = True
+  game.clicked = True
+  game.game_won = None
+  game.game_difficulty = "custom"
+  game.board_size = (len(picture), len(picture[0]))
+  game.bomb_count = game.flag_count = mines.count(1)
+  game.uncover_count = len(mines) - game.bomb_count
+  game.start_time = time.time()
+  game.end_time = None
+  game.load_squares(mines, bytearray(len(mines)))
+  return game
+
+
+class MovesTest(unittest.TestCase):
+  """ Batches of moves and chords."""
+
+  # Bombs in two corners - (1, 1) is a 1 next to the bomb at (0, 0)
+  PICTURE = (
+    "*...",
+    "....",
+    "...*",
+  )
+
+  def played(self, game, moves):
+    """ Makes a batch of moves. Returns the changed set, the events sent and the squares whose state changed."""
+    events = []
+    game.subscribe(lambda event, *args: events.append(event))
+    states = game.square_states[:]
+    changed = game.apply_moves(moves)
+    columns = game.board_size[1]
+    different = {divmod(index, columns) for index in range(len(states)) if states[index] != game.square_states[index]}
+    return changed, events, different
+
+  def test_batch_changes(self):
+    """ A batch sends a MOVE_MADE per move then one SQUARES_CHANGED, and returns every square a move changed (moves that
+    change nothing add none, squares changed back are still redrawn)."""
+    game = picture_game(self.PICTURE)
+    uncover, flag = game.state_options[1], game.state_options[2]
+    changed, events, different = self.played(game, [(uncover, (1, 1)), (flag, (0, 0)), (uncover, (1, 1)), (flag, (2, 3)),
+                                                    (flag, (2, 3))])
+    self.assertEqual(changed, {(1, 1), (0, 0), (2, 3)})
+    self.assertEqual(different, {(1, 1), (0, 0)})
+    self.assertEqual(events, [game.MOVE_MADE] * 5 + [game.SQUARES_CHANGED])
+    self.assertEqual(game.flag_count, 1)
+
+  def test_chord(self):
+    """ Chording a number with its flags uncovers every other neighbour (and the openings of its zeros) in one batch,
+    and chording a number without enough flags does nothing."""
+    game = picture_game(self.PICTURE)
+    game.move(game.state_options[1], (1, 1))
+    self.assertEqual(game.chord((1, 1)), set())
+
+    game.move(game.state_options[2], (0, 0))
+    events = []
+    game.subscribe(lambda event, *args: events.append(event))
+    states = game.square_states[:]
+    changed = game.chord((1, 1))
+
+    columns = game.board_size[1]
+    self.assertEqual(changed, {divmod(index, columns) for index in range(len(states)) if states[index] != game.square_states[index]})
+    self.assertTrue({(0, 1), (0, 2), (1, 0), (1, 2), (2, 0), (2, 1), (2, 2)} <= changed)
+    self.assertEqual(events.count(game.SQUARES_CHANGED), 1)
+    self.assertTrue(game.game_won)
+
+  def test_wrong_flag_loses_mid_batch(self):
+    """ A chord around a wrong flag uncovers the bomb and loses, the game over squares are in the same changed set, and
+    the rest of the batch is ignored."""
+    game = picture_game(self.PICTURE)
+    game.move(game.state_options[1], (1, 1))
+    game.move(game.state_options[2], (0, 1))
+
+    events = []
+    game.subscribe(lambda event, *args: events.append(event))
+    changed = game.chord((1, 1))
+
+    self.assertFalse(game.running)
+    self.assertIs(game.game_won, False)
+    self.assertEqual(changed, {(0, 0), (0, 1), (2, 3)})
+    self.assertEqual(game.square_state(0, 1), game.INCORRECT_FLAGGED)
+    self.assertEqual(game.square_state(0, 2), game.COVERED)
+    self.assertEqual(events.count(game.MOVE_MADE), 1)
+    self.assertEqual(events.count(game.SQUARES_CHANGED), 1)
+
+  def test_moves_ignored_after_game_over(self):
+    """ Batches and chords on a finished game change nothing and send nothing."""
+    game = picture_game(self.PICTURE)
+    game.move(game.state_options[1], (0, 0))
+    self.assertFalse(game.running)
+
+    changed, events, different = self.played(game, [(game.state_options[1], (1, 1)), (game.state_options[2], (2, 0))])
+    self.assertEqual((changed, events, different), (set(), [], set()))
+    self.assertEqual(game.chord((1, 1)), set())
+
+
+if __name__ == "__main__":
+  unittest.main()
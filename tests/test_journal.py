@@ -0,0 +1,102 @@
+_author_ = "Asif Rahman"
+_date_ = "Saturday, October 17, 2026"
+_version_ = "1.0"
+_filename_ = "test_journal.py"
+_description_ = "Autosave journal tests. Journals restore the game they followed after a crash, whatever the first moves were."
+
+import os
+import tempfile
+import unittest
+
+from engine import Engine
+from engine import NewEngine
+import journal
+
+
+class JournalTest(unittest.TestCase):
+  """ Following games and restoring them."""
+
+  def setUp(self):
+    """ Journals are written to a temporary directory."""
+    directory = tempfile.TemporaryDirectory()
+    self.addCleanup(directory.cleanup)
+    self.path = os.path.join(directory.name, "autosave" + journal.EXTENSION)
+
+  def followed_game(self, difficulty="expert", seed=4):
+    """ Returns a new game and a journal following it."""
+    game = NewEngine(difficulty, seed=seed)
+    game_journal = journal.Journal(self.path)
+    game_journal.start(game)
+    self.addCleanup(game_journal.stop)
+    return game, game_journal
+
+  def safe_moves(self, game, count):
+    """ Uncovers up to count covered safe squares of a clicked game in order."""
+    columns = game.board_size[1]
+    for index in range(len(game.mines)):
+      if count == 0 or not game.running:
+        break
+      if game.square_states[index] == game.COVERED and not game.mines[index]:
+        game.move(game.state_options[1], divmod(index, columns))
+        count -= 1
+
+  def assertRestores(self, game):
+    """ Asserts the journal restores the game's squares and counts."""
+    restored = Engine()
+    journal.restore(restored, self.path)
+    self.assertEqual(restored.mines, game.mines)
+    self.assertEqual(restored.square_states, game.square_states)
+    for variable in Engine.save_variables:
+      self.assertEqual(getattr(restored, variable), getattr(game, variable))
+
+  def test_snapshot_and_records(self):
+    """ The first click writes a snapshot, and later uncovers and flags are replayed from their records."""
+    game, game_journal = self.followed_game()
+    game.move(game.state_options[1], (8, 15))
+    self.safe_moves(game, 20)
+    game.move(game.state_options[2], divmod(game.mines.find(1), game.board_size[1]))
+    self.assertEqual(game_journal.record_count, 21)
+    self.assertRestores(game)
+
+  def test_record_cut_off(self):
+    """ A record cut off by a crash mid-write is ignored."""
+    game, game_journal = self.followed_game()
+    game.move(game.state_options[1], (8, 15))
+    self.safe_moves(game, 5)
+    with open(self.path, "ab") as journal_file:
+      journal_file.write(journal.RECORD.pack(1, 0, 0, 0.0)[: journal.RECORD.size // 2])
+    self.assertRestores(game)
+
+  def test_flags_before_first_click(self):
+    """ Flags placed before the first click are in the snapshot the first click writes, and nothing is written before it."""
+    game, game_journal = self.followed_game("easy")
+    game.move(game.state_options[2], (0, 0))
+    self.assertFalse(os.path.exists(self.path))
+
+    game.move(game.state_options[1], (4, 4))
+    self.assertEqual(game_journal.record_count, 0)
+    self.assertRestores(game)
+
+  def test_compaction(self):
+    """ COMPACT_EVERY records are compacted into a new snapshot, and moves after it are appended to it."""
+    game, game_journal = self.followed_game()
+    game.move(game.state_options[1], (8, 15))
+    square = divmod(game.square_states.find(game.COVERED), game.board_size[1])
+    for move in range(journal.COMPACT_EVERY + 3):
+      game.move(game.state_options[2], square)
+
+    self.assertEqual(game_journal.record_count, 3)
+    snapshot_size = journal.HEADER.unpack_from(open(self.path, "rb").read())[2]
+    self.assertEqual(os.path.getsize(self.path), journal.HEADER.size + snapshot_size + 3 * journal.RECORD.size)
+    self.assertRestores(game)
+
+  def test_finished_game_removes_journal(self):
+    """ Games that end leave nothing to restore."""
+    game, game_journal = self.followed_game()
+    game.move(game.state_options[1], (8, 15))
+    game.move(game.state_options[1], divmod(game.mines.find(1), game.board_size[1]))
+    self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == "__main__":
+  unittest.main()
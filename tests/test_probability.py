@@ -0,0 +1,27 @@
+_author_ = "Asif Rahman"
+_date_ = "Saturday, October 17, 2026"
+_version_ = "1.0"
+_filename_ = "test_probability.py"
+_description_ = "Probability tests. Every covered square's bomb probability is checked against every bomb layout that fits small games in progress."
+
+import unittest
+
+from tests.test_solver import checked_positions
+import probability
+
+
+class ProbabilityTest(unittest.TestCase):
+  """ Probabilities against brute force."""
+
+  def test_probabilities_are_exact(self):
+    """ Every covered square's probability is the share of fitting layouts with a bomb there."""
+    for game, fitting, covered, columns in checked_positions(1):
+      square_probabilities, interior = probability.Probabilities().calculate(game)
+      with self.subTest(board_code=game.board_code, states=bytes(game.square_states)):
+        for index in covered:
+          expected = sum(index in layout for layout in fitting) / len(fitting)
+          self.assertAlmostEqual(square_probabilities.get(divmod(index, columns), interior), expected, delta=1e-12)
+
+
+if __name__ == "__main__":
+  unittest.main()
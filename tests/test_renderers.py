@@ -0,0 +1,112 @@
+_author_ = "Asif Rahman"
+_date_ = "Saturday, October 17, 2026"
+_version_ = "1.0"
+_filename_ = "test_renderers.py"
+_description_ = "Renderer tests. Boards drawn with labels keep the same widgets for the whole game and remove them when destroyed, and count clicks."
+
+from unittest import mock
+import unittest
+
+try:
+  import tkinter as tk
+except ImportError:
+  tk = None
+
+
+def display_root():
+  """ Returns a hidden tkinter window, or None if there is no display (or no tkinter)."""
+  if tk is None:
+    return None
+  try:
+    root = tk.Tk()
+  except tk.TclError:
+    return None
+  root.withdraw()
+  return root
+
+
+def widget_count(widget):
+  """ Returns the number of widgets under widget (not counting widget itself)."""
+  return sum(1 + widget_count(child) for child in widget.winfo_children())
+
+
+class LabelRendererTest(unittest.TestCase):
+  """ Widget counts and clicks of boards drawn by the LabelRenderer."""
+
+  def setUp(self):
+    """ Opens a hidden window to draw boards in (skipped without a display) and draws them with labels."""
+    self.root = display_root()
+    if self.root is None:
+      self.skipTest("No display")
+
+    # Game over messages would wait for the user
+    patcher = mock.patch("board.messagebox")
+    patcher.start()
+    self.addCleanup(patcher.stop)
+
+    from board import Board
+    self.addCleanup(setattr, Board, "renderer_choice", Board.renderer_choice)
+    Board.renderer_choice = "labels"
+
+  def tearDown(self):
+    """ Closes the window."""
+    self.root.destroy()
+
+  def test_expert_game_keeps_widget_count(self):
+    """ Playing a whole expert game (every safe square uncovered, every bomb flagged) creates no widgets."""
+    from board import NewBoard
+    frame = tk.Frame(self.root)
+    board = NewBoard("expert", frame, seed=1)
+    self.root.update_idletasks()
+    count = widget_count(self.root)
+    self.assertEqual(count, 1 + 16 * 30)
+
+    columns = board.board_size[1]
+    board.move(board.state_options[1], (8, 15))
+    self.root.update_idletasks()
+    for index in range(len(board.mines)):
+      new_state = board.state_options[2 if board.mines[index] else 1]
+      board.move(new_state, divmod(index, columns))
+      self.root.update_idletasks()
+      self.assertEqual(widget_count(self.root), count)
+
+    self.assertTrue(board.game_won)
+    self.assertEqual(widget_count(self.root), count)
+
+  def test_destroyed_boards_leave_no_widgets(self):
+    """ New games destroy the old board's widgets, so any number of games leaves none behind."""
+    from board import NewBoard
+    count = widget_count(self.root)
+
+    for game in range(5):
+      board = NewBoard("expert", tk.Frame(self.root), seed=game)
+      board.move(board.state_options[1], (8, 15))
+      self.root.update_idletasks()
+      board.destroy()
+      self.assertEqual(widget_count(self.root), count)
+
+  def test_chord_is_one_click(self):
+    """ Clicks are counted once each while the game runs, however many moves a chord makes."""
+    from board import NewBoard
+    board = NewBoard("expert", tk.Frame(self.root), seed=2)
+    board.click(board.state_options[1], (8, 15))
+
+    # A number next to the first opening, with its bombs flagged by clicks
+    columns = board.board_size[1]
+    number = next(index for index in range(len(board.mines))
+                  if board.square_states[index] == board.UNCOVERED and board.counts[index])
+    row, column = divmod(number, columns)
+    bombs = [(i, j) for i in range(row - 1, row + 2) for j in range(column - 1, column + 2)
+             if 0 <= i < board.board_size[0] and 0 <= j < columns and board.mines[i * columns + j]]
+    for square in bombs:
+      board.click(board.state_options[2], square)
+
+    moves = []
+    board.subscribe(lambda event, *args: moves.append(event) if event == board.MOVE_MADE else None)
+    board.click(board.CHORD, (row, column))
+    self.assertEqual(board.click_count, 2 + len(bombs))
+    self.assertGreaterEqual(len(moves), 1)
+
+
+if __name__ == "__main__":
+  unittest.main()
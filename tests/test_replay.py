@@ -0,0 +1,57 @@
+_author_ = "Asif Rahman"
+_date_ = "Saturday, October 17, 2026"
+_version_ = "1.0"
+_filename_ = "test_replay.py"
+_description_ = "Replay tests. Recorded games play back to the same position, and replays without bombs are rejected."
+
+import os
+import tempfile
+import unittest
+
+from engine import NewEngine
+from replay import Recording
+from replay import ReplayEngine
+import replay
+import solver
+
+
+class ReplayTest(unittest.TestCase):
+  """ Recording, saving and playing back replays."""
+
+  def recorded_game(self):
+    """ Returns an expert game played by the solver from a first click in the middle, and its recording."""
+    game = NewEngine("expert", seed=3)
+    recording = Recording(game)
+    game.move(game.state_options[1], (8, 15))
+    while game.running:
+      safe = solver.solve(game)[0]
+      if not safe:
+        break
+      game.apply_moves([(game.state_options[1], square) for square in safe])
+    return game, recording
+
+  def test_seek_matches_game(self):
+    """ Seeking to the end, back and to the end again gives the recorded game's squares."""
+    game, recording = self.recorded_game()
+    path = os.path.join(tempfile.mkdtemp(), "game" + replay.EXTENSION)
+    recording.save(path)
+
+    replay_engine = ReplayEngine(*replay.load_replay(path))
+    replay_engine.seek(len(recording.moves))
+    self.assertEqual(replay_engine.square_states, game.square_states)
+    replay_engine.seek(1)
+    replay_engine.seek(len(recording.moves))
+    self.assertEqual(replay_engine.square_states, game.square_states)
+
+  def test_unclicked_start_is_rejected(self):
+    """ A start position before the first click has no bombs to replay on."""
+    game, recording = self.recorded_game()
+    # The running and clicked bits follow the magic and version
+    start = bytearray(recording.start_data())
+    start[5] &= ~2
+    with self.assertRaises(ValueError):
+      ReplayEngine(bytes(start), recording.moves)
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,108 @@
+_author_ = "Asif Rahman"
+_date_ = "Saturday, October 17, 2026"
+_version_ = "1.0"
+_filename_ = "test_save_format.py"
+_description_ = "Save file tests. Binary saves load back the same game, and saves whose counts don't match their squares are rejected."
+
+import json
+import unittest
+
+from engine import Engine
+from engine import NewEngine
+import save_format
+
+
+def played_game(seed, moves):
+  """ Returns an expert game after a first click in the middle and up to moves more (uncovering safe squares and
+  flagging bombs in order, then uncovering a bomb if moves is negative)."""
+  game = NewEngine("expert", seed=seed)
+  game.move(game.state_options[1], (8, 15))
+  columns = game.board_size[1]
+
+  for index in range(len(game.mines)):
+    if moves <= 0 or not game.running:
+      break
+    if game.square_states[index] == game.COVERED:
+      game.move(game.state_options[2 if game.mines[index] else 1], divmod(index, columns))
+      moves -= 1
+
+  if moves < 0:
+    game.move(game.state_options[1], divmod(game.mines.find(1), columns))
+  return game
+
+
+def with_header(data, **fields):
+  """ Returns binary save data with header fields replaced."""
+  names = ("magic", "version", "bits", "game_won", "rows", "columns", "bomb_count", "flag_count", "uncover_count",
+           "start_time", "end_time", "name_length")
+  header = dict(zip(names, save_format.HEADER.unpack_from(data)))
+  header.update(fields)
+  return save_format.HEADER.pack(*header.values()) + data[save_format.HEADER.size :]
+
+
+class BinarySaveTest(unittest.TestCase):
+  """ Binary save files."""
+
+  def test_round_trip(self):
+    """ Games in progress, won and lost load back the same."""
+    for moves in (0, 40, 10 ** 6, -1):
+      game = played_game(1, moves)
+      loaded = Engine()
+      save_format.load_binary_data(loaded, save_format.binary_save_data(game))
+      with self.subTest(moves=moves):
+        self.assertEqual(loaded.square_states, game.square_states)
+        self.assertEqual(loaded.mines, game.mines)
+        for variable in Engine.save_variables:
+          self.assertEqual(getattr(loaded, variable), getattr(game, variable))
+
+  def test_counts_must_match_squares(self):
+    """ Saves whose bomb, flag or covered counts don't match the planes are rejected."""
+    data = save_format.binary_save_data(played_game(2, 40))
+    for fields in ({"uncover_count" : 5000}, {"flag_count" : -40}, {"bomb_count" : 98}, {"game_won" : 1}):
+      with self.subTest(fields=fields):
+        with self.assertRaises(ValueError):
+          save_format.load_binary_data(Engine(), with_header(data, **fields))
+
+  def test_padding_bits_must_be_clear(self):
+    """ Saves with a padding bit set in any plane are rejected (a 10x10 board leaves 4 padding bits per plane)."""
+    game = NewEngine("custom", seed=6)
+    game.move(game.state_options[1], (5, 5))
+    data = save_format.binary_save_data(game)
+    start = save_format.HEADER.size + len(game.game_difficulty)
+    plane_size = (len(game.mines) + 7) // 8
+
+    for plane in range(3):
+      damaged = bytearray(data)
+      damaged[start + plane * plane_size] |= 0x80
+      with self.subTest(plane=plane):
+        with self.assertRaisesRegex(ValueError, "padding"):
+          save_format.load_binary_data(Engine(), damaged)
+
+  def test_game_in_progress_has_no_revealed_bombs(self):
+    """ A lost game's planes can't be loaded as a game in progress."""
+    data = save_format.binary_save_data(played_game(3, -1))
+    with self.assertRaises(ValueError):
+      save_format.load_binary_data(Engine(), with_header(data, bits=3, game_won=0))
+
+
+class JsonSaveTest(unittest.TestCase):
+  """ JSON save files."""
+
+  def test_round_trip(self):
+    """ A game in progress loads back the same."""
+    game = played_game(4, 40)
+    loaded = Engine()
+    save_format.load_json(loaded, json.loads(json.dumps(game.save_data())))
+    self.assertEqual(loaded.square_states, game.square_states)
+    self.assertEqual(loaded.counts, game.counts)
+
+  def test_counts_must_match_squares(self):
+    """ A JSON save whose uncover_count doesn't match its squares names the field."""
+    save_data = json.loads(json.dumps(played_game(5, 40).save_data()))
+    save_data["uncover_count"] = 5000
+    with self.assertRaisesRegex(ValueError, "uncover_count"):
+      save_format.load_json(Engine(), save_data)
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,87 @@
+_author_ = "Asif Rahman"
+_date_ = "Saturday, October 17, 2026"
+_version_ = "1.0"
+_filename_ = "test_solver.py"
+_description_ = "Solver tests. Safe and bomb squares are checked against every bomb layout that fits small games in progress."
+
+from itertools import combinations
+from math import comb
+import random
+import unittest
+
+from engine import NewEngine
+from engine import neighbours
+import solver
+
+# Games checked, and the most layouts a game's check may go through
+POSITIONS = 300
+MAX_LAYOUTS = 20000
+
+
+def positions(seed):
+  """ Yields small games in progress, each played from a random first click for a random number of safe uncovers."""
+  rng = random.Random(seed)
+  while True:
+    rows, columns = rng.randint(3, 6), rng.randint(3, 6)
+    bomb_count = rng.randint(1, rows * columns // 2)
+    game = NewEngine("custom", seed=rng.getrandbits(32), board_size=(rows, columns), bomb_count=bomb_count)
+    game.move(game.state_options[1], (rng.randrange(rows), rng.randrange(columns)))
+
+    for turn in range(rng.randrange(4)):
+      covered = [index for index in range(rows * columns) if game.square_states[index] == game.COVERED and not game.mines[index]]
+      if not game.running or not covered:
+        break
+      game.move(game.state_options[1], divmod(rng.choice(covered), columns))
+
+    if game.running:
+      yield game
+
+
+def layouts(game):
+  """ Returns every bomb layout (a set of covered indices) that fits the game's uncovered numbers and bomb count,
+  or None if there are more than MAX_LAYOUTS to try."""
+  covered = [index for index in range(len(game.square_states)) if game.square_states[index] != game.UNCOVERED]
+  if comb(len(covered), game.bomb_count) > MAX_LAYOUTS:
+    return None
+
+  surrounding = neighbours(game.board_size)
+  numbers = [(index, game.counts[index]) for index in range(len(game.square_states)) if game.square_states[index] == game.UNCOVERED]
+  fitting = []
+  for layout in combinations(covered, game.bomb_count):
+    layout = set(layout)
+    if all(sum(neighbour in layout for neighbour in surrounding[index]) == count for index, count in numbers):
+      fitting.append(layout)
+  return fitting
+
+
+def checked_positions(seed):
+  """ Yields (game, fitting layouts, covered indices, columns) for POSITIONS games small enough to brute force."""
+  checked = 0
+  for game in positions(seed):
+    fitting = layouts(game)
+    if fitting is None:
+      continue
+    columns = game.board_size[1]
+    covered = [index for index in range(len(game.square_states)) if game.square_states[index] != game.UNCOVERED]
+    yield game, fitting, covered, columns
+
+    checked += 1
+    if checked == POSITIONS:
+      return
+
+
+class SolverTest(unittest.TestCase):
+  """ Solver against brute force."""
+
+  def test_solver_is_correct_and_complete(self):
+    """ Safe squares are safe and bomb squares are bombs in every fitting layout, and (as every component of these
+    boards is small enough to enumerate) every square that is the same in all of them is found."""
+    for game, fitting, covered, columns in checked_positions(0):
+      safe = {divmod(index, columns) for index in covered if not any(index in layout for layout in fitting)}
+      mines = {divmod(index, columns) for index in covered if all(index in layout for layout in fitting)}
+      with self.subTest(board_code=game.board_code, states=bytes(game.square_states)):
+        self.assertEqual(solver.solve(game), (safe, mines))
+
+
+if __name__ == "__main__":
+  unittest.main()